@@ -1,8 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
-from app.utils.data_store import get_dataframe
+import uuid
+from app.utils.data_store import get_dataframe, store_dataframe, get_cached_result, cache_result
+from app.utils.timeseries import resample_timeseries, downsample_timeseries, MAX_POINTS_LIMIT
+from app.utils.aggregation import groupby_aggregate
+from app.utils.query import query_rows
 import math
 
 router = APIRouter()
@@ -11,6 +16,29 @@ class AnalyzeRequest(BaseModel):
     session_id: str
     column_name: str
 
+class TimeSeriesRequest(BaseModel):
+    session_id: str
+    time_column: str
+    value_columns: List[str]
+    method: str = 'resample'  # 'resample' or 'lttb'
+    bucket: str = 'auto'  # 'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year', 'auto'
+    agg: str = 'mean'  # 'sum', 'mean', 'min', 'max'
+    max_points: int = 1000
+
+class GroupByRequest(BaseModel):
+    session_id: str
+    group_by: List[str]
+    aggregations: Dict[str, List[str]] = {}  # column -> ['count', 'sum', 'mean', 'min', 'max', 'median', 'q90', ...]
+    top_n: Optional[int] = None
+
+class QueryRequest(BaseModel):
+    session_id: str
+    filters: List[dict] = []  # [{"column": "age", "op": "gt", "value": 60}, ...], combined with AND
+    columns: Optional[List[str]] = None
+    offset: int = 0
+    limit: int = 100
+    save_as_session: bool = False
+
 def safe_float(value):
     """Convert value to JSON-safe float"""
     if pd.isna(value) or math.isnan(value) if isinstance(value, float) else False:
@@ -149,6 +177,101 @@ async def get_correlations(request: dict):
         "matrix": matrix_dict
     }
 
+@router.post("/timeseries")
+async def get_timeseries(request: TimeSeriesRequest):
+    """Aggregate or downsample numeric columns over a datetime column for charting"""
+    
+    df = get_dataframe(request.session_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    if request.method not in ('resample', 'lttb'):
+        raise HTTPException(status_code=400, detail="Invalid method. Use 'resample' or 'lttb'")
+    
+    if not 3 <= request.max_points <= MAX_POINTS_LIMIT:
+        raise HTTPException(status_code=400, detail=f"max_points must be between 3 and {MAX_POINTS_LIMIT}")
+    
+    cache_key = (
+        "timeseries", request.time_column, tuple(request.value_columns),
+        request.method, request.bucket, request.agg, request.max_points
+    )
+    cached = get_cached_result(request.session_id, cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        if request.method == 'resample':
+            result = resample_timeseries(
+                df, request.time_column, request.value_columns,
+                bucket=request.bucket, agg=request.agg, max_points=request.max_points
+            )
+        else:
+            result = downsample_timeseries(
+                df, request.time_column, request.value_columns,
+                max_points=request.max_points
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    response = {
+        "time_column": request.time_column,
+        "method": request.method,
+        "agg": request.agg if request.method == 'resample' else None,
+        **result
+    }
+    cache_result(request.session_id, cache_key, response)
+    return response
+
+@router.post("/groupby")
+async def get_groupby(request: GroupByRequest):
+    """Aggregate columns per group, keeping the top N groups and an 'Other' bucket"""
+    
+    df = get_dataframe(request.session_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    cache_key = (
+        "groupby", tuple(request.group_by),
+        tuple((col, tuple(funcs)) for col, funcs in sorted(request.aggregations.items())),
+        request.top_n
+    )
+    cached = get_cached_result(request.session_id, cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response = groupby_aggregate(df, request.group_by, request.aggregations, request.top_n)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    cache_result(request.session_id, cache_key, response)
+    return response
+
+@router.post("/query")
+async def query_data(request: QueryRequest):
+    """Filter rows with structured predicates and return a page of matching rows"""
+    
+    df = get_dataframe(request.session_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        result, positions = query_rows(
+            request.session_id, df, request.filters,
+            columns=request.columns, offset=request.offset, limit=request.limit
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Optionally keep the filtered rows as a new session
+    if request.save_as_session:
+        derived = df[result["columns"]].iloc[positions].reset_index(drop=True)
+        derived_session_id = str(uuid.uuid4())
+        store_dataframe(derived_session_id, derived)
+        result["derived_session_id"] = derived_session_id
+    
+    return result
+
 @router.get("/preview/{session_id}")
 async def preview_data(session_id: str, rows: int = 10):
     """Get a preview of the data"""
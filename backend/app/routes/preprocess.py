@@ -1,19 +1,36 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Optional
-from app.utils.data_store import get_dataframe, store_dataframe
+from typing import List, Dict, Optional
+from app.utils.data_store import get_dataframe, store_dataframe, get_cached_result, cache_result
 from app.utils.preprocessing import (
     drop_columns,
     handle_missing_values,
+    impute_missing_values,
     one_hot_encode,
     label_encode,
     normalize_data,
     remove_duplicates,
+    find_duplicates,
+    row_fingerprints,
+    detect_outliers,
+    handle_outliers,
     get_column_info
 )
 
 router = APIRouter()
 
+def get_row_fingerprints(session_id: str, df, subset: Optional[List[str]] = None):
+    """Row fingerprints for df, cached while df is the session's current data"""
+    if df is not get_dataframe(session_id):
+        return row_fingerprints(df, subset)
+    
+    key = ("row_fingerprints", tuple(subset) if subset else None)
+    fingerprints = get_cached_result(session_id, key)
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df, subset)
+        cache_result(session_id, key, fingerprints)
+    return fingerprints
+
 class PreprocessRequest(BaseModel):
     session_id: str
     operations: List[dict]
@@ -26,6 +43,10 @@ class MissingValuesRequest(BaseModel):
     session_id: str
     strategy: str  # 'mean', 'median', 'mode', 'drop', 'fill_zero'
 
+class ImputeRequest(BaseModel):
+    session_id: str
+    strategies: Dict[str, dict]  # column -> {"strategy": "mean" | "median" | "mode" | "constant" | "ffill" | "bfill" | "group_median", ...}
+
 class EncodeRequest(BaseModel):
     session_id: str
     columns: List[str]
@@ -35,6 +56,18 @@ class NormalizeRequest(BaseModel):
     session_id: str
     columns: Optional[List[str]] = None
 
+class DuplicatesRequest(BaseModel):
+    session_id: str
+    subset: Optional[List[str]] = None
+    keep: str = 'first'  # 'first', 'last', 'none'
+    dry_run: bool = False
+
+class OutlierRequest(BaseModel):
+    session_id: str
+    method: str = 'iqr'  # 'iqr', 'zscore', 'mad'
+    columns: Optional[List[str]] = None
+    threshold: Optional[float] = None
+
 @router.post("/preprocess")
 async def preprocess_data(request: PreprocessRequest):
     """Apply multiple preprocessing operations"""
@@ -56,6 +89,9 @@ async def preprocess_data(request: PreprocessRequest):
                 strategy = operation.get('strategy', 'mean')
                 df = handle_missing_values(df, strategy)
             
+            elif op_type == 'impute':
+                df, _ = impute_missing_values(df, operation.get('strategies', {}))
+            
             elif op_type == 'one_hot_encode':
                 columns = operation.get('columns', [])
                 df = one_hot_encode(df, columns)
@@ -69,7 +105,22 @@ async def preprocess_data(request: PreprocessRequest):
                 df = normalize_data(df, columns)
             
             elif op_type == 'remove_duplicates':
-                df = remove_duplicates(df)
+                subset = operation.get('subset')
+                df = remove_duplicates(
+                    df,
+                    subset=subset,
+                    keep=operation.get('keep', 'first'),
+                    fingerprints=get_row_fingerprints(request.session_id, df, subset)
+                )
+            
+            elif op_type == 'outliers':
+                df = handle_outliers(
+                    df,
+                    method=operation.get('method', 'iqr'),
+                    action=operation.get('action', 'clip'),
+                    columns=operation.get('columns'),
+                    threshold=operation.get('threshold')
+                )
         
         # Store updated DataFrame
         store_dataframe(request.session_id, df)
@@ -130,6 +181,33 @@ async def handle_missing_endpoint(request: MissingValuesRequest):
         "new_null_count": int(new_nulls)
     }
 
+@router.post("/impute")
+async def impute_endpoint(request: ImputeRequest):
+    """Fill missing values with a strategy per column and return the fill values used"""
+    
+    df = get_dataframe(request.session_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        imputed, fill_values = impute_missing_values(df, request.strategies)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Counted only once the columns are validated; df itself is left unchanged
+    columns = list(request.strategies)
+    original_nulls = df[columns].isnull().sum().sum() if columns else 0
+    new_nulls = imputed[columns].isnull().sum().sum() if columns else 0
+    df = imputed
+    
+    store_dataframe(request.session_id, df)
+    
+    return {
+        "message": "Missing values imputed",
+        "fill_values": fill_values,
+        "original_null_count": int(original_nulls),
+        "new_null_count": int(new_nulls)
+    }
+
 @router.post("/encode")
 async def encode_columns_endpoint(request: EncodeRequest):
     """Encode categorical columns"""
@@ -187,25 +265,45 @@ async def normalize_endpoint(request: NormalizeRequest):
         "normalized_columns": columns_normalized
     }
 
+@router.post("/detect-outliers")
+async def detect_outliers_endpoint(request: OutlierRequest):
+    """Get outlier bounds and counts per numeric column"""
+    
+    df = get_dataframe(request.session_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        return detect_outliers(df, request.method, request.columns, request.threshold)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/remove-duplicates")
-async def remove_duplicates_endpoint(request: dict):
-    """Remove duplicate rows"""
+async def remove_duplicates_endpoint(request: DuplicatesRequest):
+    """Remove duplicate rows, or only count them with dry_run"""
     
-    session_id = request.get("session_id")
-    df = get_dataframe(session_id)
+    df = get_dataframe(request.session_id)
     
     if df is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    original_rows = len(df)
-    df = remove_duplicates(df)
-    new_rows = len(df)
+    try:
+        fingerprints = get_row_fingerprints(request.session_id, df, request.subset)
+        
+        if request.dry_run:
+            return find_duplicates(df, request.subset, request.keep, fingerprints=fingerprints)
+        
+        original_rows = len(df)
+        df = remove_duplicates(df, request.subset, request.keep, fingerprints=fingerprints)
+        new_rows = len(df)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    store_dataframe(session_id, df)
+    store_dataframe(request.session_id, df)
     
     return {
         "message": "Duplicates removed",
         "original_rows": original_rows,
         "new_rows": new_rows,
         "duplicates_removed": original_rows - new_rows
-    }
\ No newline at end of file
+    }
@@ -1,14 +1,36 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Optional
 import pandas as pd
 import numpy as np
 import uuid
 import io
 from app.utils.data_store import store_dataframe
 from app.utils.preprocessing import get_column_info
+from app.utils.chunked_upload import IncrementalCSVParser, create_upload, get_upload, delete_upload
+from app.utils.file_readers import (
+    FILE_FORMATS,
+    TYPED_FORMATS,
+    MissingColumnsError,
+    check_columns,
+    get_file_format,
+    read_parquet,
+    read_feather,
+    read_jsonl,
+    read_excel,
+    column_types_from_schema
+)
 
 router = APIRouter()
 
+# Strings read as missing values when parsing CSV
+CSV_NA_VALUES = ['-', '--', 'N/A', 'NA', 'n/a', 'null', 'NULL', 'None', 'none', 'NaN', 'nan']
+
+class UploadInitRequest(BaseModel):
+    filename: str
+    total_parts: Optional[int] = None
+
 def detect_column_types(df: pd.DataFrame):
     """Enhanced column type detection"""
     numeric_cols = []
@@ -75,54 +97,250 @@ def handle_null_representations(df: pd.DataFrame):
     
     return df
 
+def detect_text_column_types(df: pd.DataFrame):
+    """Keep numeric and datetime dtypes, run detect_column_types on the rest
+
+    For formats like JSON-lines whose numbers are typed but whose dates
+    arrive as strings.
+    """
+    schema_types = column_types_from_schema(df)
+    text_cols = [col for col in df.columns
+                 if not pd.api.types.is_numeric_dtype(df[col])
+                 and not pd.api.types.is_datetime64_any_dtype(df[col])]
+    if not text_cols:
+        return schema_types
+    
+    text_df = df[text_cols].copy()
+    text_types = detect_column_types(text_df)
+    for col in text_cols:
+        df[col] = text_df[col]
+    
+    # Merge both classifications, keeping the column order of df
+    merged = []
+    for schema_list, text_list in zip(schema_types, text_types):
+        members = (set(schema_list) - set(text_cols)) | set(text_list)
+        merged.append([col for col in df.columns if col in members])
+    return tuple(merged)
+
+def chunked_upload_summary(parser: IncrementalCSVParser, df: pd.DataFrame):
+    """(column_types, column_info) of a chunked upload from its parse-time profiles
+
+    Only columns whose chunks parsed as different kinds go through
+    detect_column_types and get_column_info here.
+    """
+    types, infos = parser.column_summary(df)
+    undetected = [col for col in df.columns if types[col] is None]
+    if undetected:
+        undetected_df = df[undetected].copy()
+        detected = detect_column_types(undetected_df)
+        for col in undetected:
+            df[col] = undetected_df[col]
+        for column_type, cols in zip(('numeric', 'categorical', 'datetime'), detected):
+            types.update(dict.fromkeys(cols, column_type))
+        infos.update({info['name']: info for info in get_column_info(df[undetected])['columns']})
+    
+    column_types = tuple(
+        [col for col in df.columns if types[col] == column_type]
+        for column_type in ('numeric', 'categorical', 'datetime')
+    )
+    column_info = {
+        'columns': [infos[col] for col in df.columns],
+        'total_rows': len(df),
+        'total_columns': len(df.columns)
+    }
+    return column_types, column_info
+
+def create_dataset_session(df: pd.DataFrame, filename: str, column_types: tuple = None,
+                           column_info: dict = None) -> dict:
+    """Detect column types, store the DataFrame in a new session and build its summary
+
+    column_types: (numeric, categorical, datetime) lists already known from
+    the file's schema; detect_column_types runs only when it is None.
+    column_info: get_column_info result already known; computed when None.
+    """
+    if column_types is not None:
+        numeric_cols, categorical_cols, datetime_cols = column_types
+    else:
+        # Detect column types with enhanced logic
+        numeric_cols, categorical_cols, datetime_cols = detect_column_types(df)
+    
+    # Generate unique session ID
+    session_id = str(uuid.uuid4())
+    
+    # Store DataFrame
+    store_dataframe(session_id, df)
+    
+    # Create summary
+    return {
+        "session_id": session_id,
+        "filename": filename,
+        "rows": len(df),
+        "columns": len(df.columns),
+        "column_names": df.columns.tolist(),
+        "numeric_columns": numeric_cols,
+        "categorical_columns": categorical_cols,
+        "datetime_columns": datetime_cols,
+        "column_info": column_info if column_info is not None else get_column_info(df)
+    }
+
 @router.post("/upload")
-async def upload_csv(file: UploadFile = File(...)):
-    """Upload a CSV file and return session ID with summary"""
+async def upload_csv(file: UploadFile = File(...), columns: Optional[str] = Form(None)):
+    """Upload a CSV, Parquet, Feather, JSON-lines or Excel file and return session ID with summary
+
+    columns: optional comma-separated list of columns to load
+    """
     
     # Validate file type
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    file_format, extension = get_file_format(file.filename)
+    if file_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(FILE_FORMATS)}"
+        )
+    
+    selected_columns = [col.strip() for col in columns.split(',') if col.strip()] if columns else None
     
     try:
-        # Read CSV file
-        contents = await file.read()
-        
-        # Read with common null values
-        df = pd.read_csv(
-            io.BytesIO(contents),
-            na_values=['-', '--', 'N/A', 'NA', 'n/a', 'null', 'NULL', 'None', 'none', 'NaN', 'nan'],
-            keep_default_na=True
-        )
-        
-        # Additional null handling
-        df = handle_null_representations(df)
-        
-        # Detect column types with enhanced logic
-        numeric_cols, categorical_cols, datetime_cols = detect_column_types(df)
+        if file_format == 'csv':
+            # Read CSV file
+            contents = await file.read()
+            
+            if selected_columns is not None:
+                header = pd.read_csv(io.BytesIO(contents), nrows=0).columns
+                check_columns(header, selected_columns)
+            
+            # Read with common null values
+            df = pd.read_csv(
+                io.BytesIO(contents),
+                na_values=CSV_NA_VALUES,
+                keep_default_na=True,
+                usecols=selected_columns
+            )
+            
+            # Additional null handling
+            df = handle_null_representations(df)
         
-        # Generate unique session ID
-        session_id = str(uuid.uuid4())
+        # Typed formats are read straight from the spooled upload without text parsing
+        elif file_format == 'parquet':
+            df = read_parquet(file.file, selected_columns)
+        elif file_format == 'feather':
+            df = read_feather(file.file, selected_columns)
+        elif file_format == 'jsonl':
+            df = read_jsonl(file.file, selected_columns)
+        else:
+            df = read_excel(file.file, extension, selected_columns, na_values=CSV_NA_VALUES)
         
-        # Store DataFrame
-        store_dataframe(session_id, df)
+        if file_format in TYPED_FORMATS:
+            column_types = column_types_from_schema(df)
+        elif file_format == 'jsonl':
+            column_types = detect_text_column_types(df)
+        else:
+            column_types = None
         
-        # Create summary
-        summary = {
-            "session_id": session_id,
-            "filename": file.filename,
-            "rows": len(df),
-            "columns": len(df.columns),
-            "column_names": df.columns.tolist(),
-            "numeric_columns": numeric_cols,
-            "categorical_columns": categorical_cols,
-            "datetime_columns": datetime_cols,
-            "column_info": get_column_info(df)
-        }
+        summary = create_dataset_session(df, file.filename, column_types)
         
         return JSONResponse(content=summary, status_code=200)
     
+    except MissingColumnsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ImportError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing {file_format.upper()}: {str(e)}")
+
+@router.post("/upload/init")
+async def init_chunked_upload(request: UploadInitRequest):
+    """Start a resumable chunked CSV upload"""
+    
+    if not request.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+    
+    if request.total_parts is not None and request.total_parts < 1:
+        raise HTTPException(status_code=400, detail="total_parts must be at least 1")
+    
+    # Null handling runs on each parsed chunk while the rest is still uploading
+    parser = IncrementalCSVParser(
+        transform=handle_null_representations,
+        na_values=CSV_NA_VALUES,
+        keep_default_na=True
+    )
+    upload = create_upload(request.filename, parser, request.total_parts)
+    
+    return upload.status()
+
+@router.put("/upload/{upload_id}/parts/{part_number}")
+async def upload_part(upload_id: str, part_number: int, request: Request):
+    """Upload one part (raw bytes in the request body); re-sending a part is a no-op"""
+    
+    upload = get_upload(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    data = await request.body()
+    
+    try:
+        accepted = upload.add_part(part_number, data)
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        # Malformed CSV cannot be fixed by re-sending the same bytes
+        delete_upload(upload_id)
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        delete_upload(upload_id)
+        raise HTTPException(status_code=500, detail=f"Error processing CSV: {str(e)}")
+    
+    return {"part_number": part_number, "accepted": accepted, **upload.status()}
+
+@router.get("/upload/{upload_id}")
+async def get_upload_status(upload_id: str):
+    """Get received and missing parts so an interrupted upload can resume"""
+    
+    upload = get_upload(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    return upload.status()
+
+@router.post("/upload/{upload_id}/complete")
+async def complete_chunked_upload(upload_id: str):
+    """Finish a chunked upload and return session ID with summary
+
+    Parsing, null handling, type detection and column stats already happened
+    as parts arrived; here the per-chunk results are only merged.
+    """
+    
+    upload = get_upload(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    try:
+        df = upload.finish()
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        delete_upload(upload_id)
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
+        delete_upload(upload_id)
         raise HTTPException(status_code=500, detail=f"Error processing CSV: {str(e)}")
+    
+    delete_upload(upload_id)
+    
+    try:
+        summary = create_dataset_session(df, upload.filename, *chunked_upload_summary(upload.parser, df))
+        return JSONResponse(content=summary, status_code=200)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing CSV: {str(e)}")
+
+@router.delete("/upload/{upload_id}")
+async def abort_chunked_upload(upload_id: str):
+    """Discard an in-progress chunked upload"""
+    
+    if not delete_upload(upload_id):
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    return {"message": "Upload aborted"}
 
 @router.get("/session/{session_id}")
 async def get_session_info(session_id: str):
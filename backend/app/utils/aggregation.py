@@ -0,0 +1,150 @@
+import pandas as pd
+import numpy as np
+import re
+from typing import List, Dict, Any, Optional, Tuple
+from app.utils.serialization import json_value
+
+BASIC_AGGREGATIONS = ['count', 'sum', 'mean', 'min', 'max']
+
+# Quantiles are requested as 'median' or 'qNN' (e.g. 'q25', 'q90')
+QUANTILE_PATTERN = re.compile(r'^q(\d{1,2})$')
+
+MAX_GROUPS = 1000
+
+OTHER_LABEL = 'Other'
+
+def parse_aggregation(name: str) -> Tuple[str, Optional[float]]:
+    """Return (kind, quantile) for an aggregation name"""
+    if name in BASIC_AGGREGATIONS:
+        return name, None
+    if name == 'median':
+        return 'quantile', 0.5
+    match = QUANTILE_PATTERN.match(name)
+    if match:
+        return 'quantile', int(match.group(1)) / 100
+    raise ValueError(
+        f"Invalid aggregation '{name}'. Use one of: {', '.join(BASIC_AGGREGATIONS)}, median, or qNN (e.g. q90)"
+    )
+
+def group_codes(df: pd.DataFrame, keys: List[str]) -> Tuple[np.ndarray, List[tuple]]:
+    """Hash-factorize group keys into dense integer group ids
+
+    Categorical keys are factorized from their existing codes. Multiple keys
+    are combined pairwise and re-factorized so ids stay dense.
+
+    Returns:
+        (group id per row, key labels per group id)
+    """
+    key_codes = []
+    key_uniques = []
+    for key in keys:
+        codes, uniques = pd.factorize(df[key], use_na_sentinel=False)
+        key_codes.append(codes)
+        key_uniques.append(np.asarray(uniques, dtype=object))
+
+    # Combine keys left to right, remembering the uniques of each step for decoding
+    gid = key_codes[0].astype(np.int64)
+    steps = []
+    for codes, uniques in zip(key_codes[1:], key_uniques[1:]):
+        combined = gid * len(uniques) + codes
+        gid, combined_uniques = pd.factorize(combined)
+        steps.append((combined_uniques, len(uniques)))
+
+    # Decode each dense group id back into one label per key
+    ngroups = int(gid.max()) + 1 if len(gid) else 0
+    per_key = [None] * len(keys)
+    current = np.arange(ngroups, dtype=np.int64)
+    for i in range(len(steps) - 1, -1, -1):
+        combined_uniques, width = steps[i]
+        current, codes = np.divmod(combined_uniques[current], width)
+        per_key[i + 1] = key_uniques[i + 1][codes]
+    per_key[0] = key_uniques[0][current]
+
+    labels = list(zip(*per_key)) if ngroups else []
+    return gid, labels
+
+def groupby_aggregate(df: pd.DataFrame, group_by: List[str],
+                      aggregations: Dict[str, List[str]],
+                      top_n: Optional[int] = None) -> Dict[str, Any]:
+    """Aggregate numeric columns per group
+
+    Args:
+        df: Input DataFrame
+        group_by: Key columns
+        aggregations: Column -> list of aggregation names
+            ('count', 'sum', 'mean', 'min', 'max', 'median', 'qNN')
+        top_n: Keep the top_n largest groups and fold the rest into an
+            'Other' bucket. Capped at MAX_GROUPS.
+    """
+    if not group_by:
+        raise ValueError("At least one group_by column is required")
+    for col in list(group_by) + list(aggregations):
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found")
+
+    parsed = {}
+    for col, names in aggregations.items():
+        if not names:
+            raise ValueError(f"No aggregations given for column '{col}'")
+        parsed[col] = [(name, *parse_aggregation(name)) for name in names]
+        if any(kind != 'count' for _, kind, _ in parsed[col]) and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Column '{col}' is not numeric; only 'count' is supported")
+
+    top_n = MAX_GROUPS if top_n is None else top_n
+    if not 1 <= top_n <= MAX_GROUPS:
+        raise ValueError(f"top_n must be between 1 and {MAX_GROUPS}")
+
+    gid, labels = group_codes(df, group_by)
+    sizes = np.bincount(gid, minlength=len(labels))
+    total_groups = len(labels)
+
+    # Largest groups first; everything beyond top_n shares one extra id
+    order = np.argsort(-sizes, kind='stable')
+    kept = order[:top_n]
+    has_other = total_groups > top_n
+    remap = np.full(total_groups, len(kept), dtype=np.int64)
+    remap[kept] = np.arange(len(kept))
+    gid = remap[gid]
+
+    grouped = df[list(aggregations)].groupby(gid, sort=True)
+    results = {}
+    basic = {col: [kind for _, kind, _ in specs if kind != 'quantile'] for col, specs in parsed.items()}
+    basic = {col: kinds for col, kinds in basic.items() if kinds}
+    if basic:
+        frame = grouped.agg(basic)
+        for col, kinds in basic.items():
+            for kind in kinds:
+                results[(col, kind)] = frame[(col, kind)].to_numpy()
+    for col, specs in parsed.items():
+        for name, kind, q in specs:
+            if kind == 'quantile':
+                results[(col, name)] = grouped[col].quantile(q).to_numpy()
+
+    def build_row(i: int) -> Dict[str, Any]:
+        row = {}
+        for col, specs in parsed.items():
+            for name, kind, _ in specs:
+                key = (col, kind if kind != 'quantile' else name)
+                row[f"{col}_{name}"] = json_value(results[key][i])
+        return row
+
+    groups = []
+    for i, g in enumerate(kept):
+        row = {key: json_value(label) for key, label in zip(group_by, labels[g])}
+        row["count"] = int(sizes[g])
+        row.update(build_row(i))
+        groups.append(row)
+
+    other = None
+    if has_other:
+        other = {key: OTHER_LABEL for key in group_by}
+        other["count"] = int(sizes[order[top_n:]].sum())
+        other["group_count"] = total_groups - top_n
+        other.update(build_row(top_n))
+
+    return {
+        "group_by": group_by,
+        "total_groups": total_groups,
+        "groups": groups,
+        "other": other
+    }
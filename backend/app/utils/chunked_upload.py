@@ -0,0 +1,485 @@
+import pandas as pd
+import numpy as np
+import copy
+import io
+import time
+import uuid
+import warnings
+from pandas.tseries.api import guess_datetime_format
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Distinct values kept per column; past this, unique_count is counted on the combined column
+MAX_TRACKED_UNIQUES = 100000
+
+def _column_kind(column: pd.Series) -> Optional[str]:
+    """Broad type of a parsed chunk column (None if it holds no values)"""
+    if column.isnull().all():
+        return None
+    if pd.api.types.is_bool_dtype(column):
+        return 'bool'
+    if column.dtype == object and column.dropna().map(type).eq(bool).all():
+        # A bool column with empty cells parses as object holding bools and NaN
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(column):
+        return 'numeric'
+    return 'text'
+
+def _restore_nulls(converted: pd.Series, column: pd.Series) -> pd.Series:
+    """Put values converted from column.dropna() back at their rows, missing elsewhere"""
+    valid = column.notna().to_numpy()
+    if valid.all():
+        return converted
+    positions = np.full(len(valid), -1)
+    positions[valid] = np.arange(len(converted))
+    return pd.Series(converted.array.take(positions, allow_fill=True), index=column.index)
+
+def _numbers_from_text(column: pd.Series) -> pd.Series:
+    """Convert text to numbers as detect_column_types does; raises if a value is not a number"""
+    sample = column.dropna()
+    return _restore_nulls(pd.to_numeric(sample.astype(str).str.replace(',', '').str.strip(), errors='raise'), column)
+
+def _dates_from_text(column: pd.Series, date_format: str) -> pd.Series:
+    """Convert text to datetimes as detect_column_types does; raises if a value is not a date"""
+    return _restore_nulls(pd.to_datetime(column.dropna(), format=date_format, errors='raise'), column)
+
+class ValueStats:
+    """Count, sum, range and distinct values of the non-null values seen so far
+
+    merge() returns a new instance, so stats can be computed for a chunk
+    and only kept once the chunk is accepted.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.low = None
+        self.high = None
+        # None once there are more than MAX_TRACKED_UNIQUES
+        self.uniques: Optional[np.ndarray] = np.empty(0)
+
+    def merge(self, values: pd.Series) -> 'ValueStats':
+        """Stats with values (already free of nulls) added"""
+        stats = copy.copy(self)
+        if not len(values):
+            return stats
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            low, high = values.min().item(), values.max().item()
+            stats.count += len(values)
+            stats.total += values.sum().item()
+            stats.low = low if self.low is None else min(self.low, low)
+            stats.high = high if self.high is None else max(self.high, high)
+        if self.uniques is not None:
+            chunk = np.asarray(values.unique())
+            uniques = pd.unique(np.concatenate([self.uniques, chunk])) if len(self.uniques) else chunk
+            stats.uniques = uniques if len(uniques) <= MAX_TRACKED_UNIQUES else None
+        return stats
+
+class ColumnProfile:
+    """What detect_column_types and get_column_info need to know about one column
+
+    Built chunk by chunk as parts arrive, so the upload summary needs no pass
+    over the combined frame. Text chunks are also converted the way
+    detect_column_types converts a whole column: to numbers (thousands
+    separators removed), or else to dates. Converted chunks and their stats
+    are kept for as long as every chunk so far has converted.
+    """
+
+    def __init__(self):
+        self.kinds = set()
+        self.nulls = 0
+        self.raw = ValueStats()
+        # Set to None once a chunk fails to convert; the chunk lists line up with the parsed chunks
+        self.numeric: Optional[ValueStats] = ValueStats()
+        self.numeric_chunks: Optional[List[Optional[pd.Series]]] = []
+        # Dates are only tried after numbers are ruled out
+        self.dates: Optional[ValueStats] = ValueStats()
+        self.date_chunks: Optional[List[Optional[pd.Series]]] = None
+        self.date_format: Optional[str] = None
+
+    def observe(self, column: pd.Series, earlier: List[pd.Series]) -> 'ColumnProfile':
+        """Profile with the next chunk of the column added; self is left unchanged
+
+        earlier: the column in every previous chunk, converted to dates when
+        this chunk rules out numbers
+        """
+        kind = _column_kind(column)
+        profile = copy.copy(self)
+        values = column.dropna()
+        profile.nulls += len(column) - len(values)
+        profile.raw = self.raw.merge(values)
+        if kind is not None:
+            profile.kinds = self.kinds | {kind}
+        if kind not in (None, 'text'):
+            # Only text columns are converted; numbers next to text are re-read as text on close
+            profile.numeric = profile.numeric_chunks = profile.dates = profile.date_chunks = None
+            return profile
+
+        if self.numeric is not None:
+            try:
+                converted = _numbers_from_text(column) if kind else None
+            except (ValueError, TypeError):
+                profile.numeric = profile.numeric_chunks = None
+            else:
+                profile.numeric = self.numeric.merge(converted.dropna()) if kind else self.numeric
+                profile.numeric_chunks = self.numeric_chunks + [converted]
+                return profile
+
+        if self.dates is not None:
+            if self.date_chunks is None:
+                # Numbers were just ruled out, so the earlier chunks are converted too
+                pending, dates, chunks = earlier + [column], ValueStats(), []
+            else:
+                pending, dates, chunks = [column], self.dates, list(self.date_chunks)
+            date_format = self.date_format
+            try:
+                for part in pending:
+                    if _column_kind(part) is None:
+                        chunks.append(None)
+                        continue
+                    if date_format is None:
+                        # read_csv-style inference guesses one format from the first value;
+                        # without a guess every value is parsed on its own
+                        date_format = guess_datetime_format(part.dropna().iloc[0]) or 'mixed'
+                    converted = _dates_from_text(part, date_format)
+                    dates = dates.merge(converted.dropna())
+                    chunks.append(converted)
+            except (ValueError, TypeError, OverflowError):
+                profile.dates = profile.date_chunks = None
+            else:
+                profile.dates, profile.date_chunks, profile.date_format = dates, chunks, date_format
+        return profile
+
+    def keep_chunks(self, kept: List[int]) -> None:
+        """Drop the converted chunks of dropped parsed chunks"""
+        if self.numeric_chunks is not None:
+            self.numeric_chunks = [self.numeric_chunks[i] for i in kept]
+        if self.date_chunks is not None:
+            self.date_chunks = [self.date_chunks[i] for i in kept]
+
+    def resolve(self) -> Tuple[Optional[str], Optional[List[Optional[pd.Series]]]]:
+        """(column type, converted chunks to swap in)
+
+        The type is 'numeric', 'categorical', 'datetime' or 'bool' (numeric
+        when no value is missing); None when chunks disagree on the kind.
+        """
+        if len(self.kinds) > 1:
+            return None, None
+        if not self.kinds:
+            return 'categorical', None
+        kind = next(iter(self.kinds))
+        if kind != 'text':
+            return kind, None
+        if self.numeric is not None:
+            return 'numeric', self.numeric_chunks
+        if self.dates is not None and len({getattr(c.dtype, 'tz', None) for c in self.date_chunks if c is not None}) == 1:
+            # Mixed UTC offsets fail a whole-column conversion
+            return 'datetime', self.date_chunks
+        return 'categorical', None
+
+    def info(self, name: str, column: pd.Series, column_type: str) -> Dict[str, Any]:
+        """Column entry of get_column_info, from the profile instead of the data
+
+        The mean adds up per-chunk sums, so for float columns it can differ
+        from a single pass in the last digit.
+        """
+        stats = self.raw
+        if 'text' in self.kinds and column_type == 'numeric':
+            stats = self.numeric
+        elif 'text' in self.kinds and column_type == 'datetime':
+            stats = self.dates
+        rows = len(column)
+        unique_count = len(stats.uniques) if stats.uniques is not None else column.nunique()
+        col_info = {
+            'name': name,
+            'dtype': str(column.dtype),
+            'null_count': self.nulls,
+            'null_percentage': float(self.nulls / rows * 100) if rows > 0 else 0.0,
+            'unique_count': int(unique_count)
+        }
+        if column.dtype in [np.float64, np.int64]:
+            col_info['min'] = float(stats.low) if stats.count else None
+            col_info['max'] = float(stats.high) if stats.count else None
+            col_info['mean'] = float(stats.total / stats.count) if stats.count else None
+        return col_info
+
+class IncrementalCSVParser:
+    """Parse a CSV byte stream piece by piece as it arrives
+
+    Bytes are buffered until a record boundary (a newline outside quotes),
+    then everything up to that boundary is parsed into a DataFrame chunk.
+    The header is taken from the first piece and reused for the rest.
+
+    Each chunk infers its own dtypes. A column that comes out numeric in
+    some chunks and text in others is re-read as text from the raw chunk
+    bytes on close, so the result matches a single read_csv of the file.
+    Every chunk also updates a ColumnProfile per column, from which close()
+    settles the column types and column_summary() builds the column stats.
+    """
+
+    def __init__(self, transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None, **read_kwargs):
+        self.transform = transform
+        self.read_kwargs = read_kwargs
+        self.columns: Optional[List[str]] = None
+        self.frames: List[pd.DataFrame] = []
+        self.rows = 0
+        self._buffer = b''
+        # (raw bytes, holds header) of every parsed chunk, kept to re-read conflicting columns
+        self._chunks: List[Tuple[bytes, bool]] = []
+        # Leading fields that read_csv turned into the index (rows wider than the header)
+        self._index_names: List[Optional[str]] = []
+        self.profiles: Dict[str, ColumnProfile] = {}
+        # Column -> type settled on close (None: chunks disagreed, detect on the combined column)
+        self.column_types: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _record_boundary(data: bytes) -> int:
+        """Index just past the last newline that is not inside a quoted field (0 if none)"""
+        pos = data.rfind(b'\n')
+        if pos == -1:
+            return 0
+        # Escaped quotes ("") keep the count even, so odd means we're inside a field
+        quotes = data.count(b'"', 0, pos)
+        while pos != -1:
+            if quotes % 2 == 0:
+                return pos + 1
+            prev = data.rfind(b'\n', 0, pos)
+            quotes -= data.count(b'"', prev + 1, pos)
+            pos = prev
+        return 0
+
+    def _read(self, data: bytes, first: bool, **kwargs) -> pd.DataFrame:
+        """Read one chunk with the header and index layout of the first chunk"""
+        if first:
+            return pd.read_csv(io.BytesIO(data), **self.read_kwargs, **kwargs)
+
+        levels = len(self._index_names)
+        names = [f"__index_{i}" for i in range(levels)] + self.columns
+        with warnings.catch_warnings():
+            # A row wider than the header is a ParserError in a single read_csv;
+            # with index_col=False pandas would only warn and truncate it
+            warnings.simplefilter('error', pd.errors.ParserWarning)
+            try:
+                df = pd.read_csv(
+                    io.BytesIO(data), header=None, names=names,
+                    index_col=list(range(levels)) if levels else False,
+                    **self.read_kwargs, **kwargs
+                )
+            except pd.errors.ParserWarning as e:
+                raise pd.errors.ParserError(f"Error tokenizing data: {e}")
+        if levels:
+            df.index.names = self._index_names
+        return df
+
+    def _parse(self, data: bytes) -> Tuple[Optional[pd.DataFrame], Dict[str, ColumnProfile]]:
+        """Parse complete records and profile them without changing any parser state"""
+        if not data.strip():
+            return None, self.profiles
+        df = self._read(data, first=self.columns is None)
+        if self.transform is not None:
+            df = self.transform(df)
+        profiles = {
+            col: self.profiles.get(col, ColumnProfile()).observe(
+                df[col], [frame[col] for frame in self.frames])
+            for col in df.columns
+        }
+        return df, profiles
+
+    def _commit(self, data: bytes, df: Optional[pd.DataFrame], profiles: Dict[str, ColumnProfile]) -> None:
+        if df is None:
+            return
+        if self.columns is None:
+            self.columns = df.columns.tolist()
+            if not isinstance(df.index, pd.RangeIndex):
+                self._index_names = list(df.index.names)
+        self.frames.append(df)
+        self._chunks.append((data, len(self._chunks) == 0))
+        self.rows += len(df)
+        self.profiles = profiles
+
+    def feed(self, data: bytes) -> None:
+        """Add bytes and parse every complete record received so far
+
+        If parsing fails, the parser is left exactly as it was before the call.
+        """
+        buffer = self._buffer + data
+        boundary = self._record_boundary(buffer)
+        if not boundary:
+            self._buffer = buffer
+            return
+        complete = buffer[:boundary]
+        self._commit(complete, *self._parse(complete))
+        self._buffer = buffer[boundary:]
+
+    def _align_null_chunks(self) -> None:
+        """Give all-null chunk columns the dtype of the text chunks around them
+
+        An all-null chunk parses as float; concatenated with string chunks it
+        would turn the column into object instead of the single-read dtype.
+        """
+        for col in self.columns:
+            kinds = [_column_kind(frame[col]) for frame in self.frames]
+            text = [frame[col].dtype for frame, kind in zip(self.frames, kinds) if kind == 'text']
+            if not text or None not in kinds:
+                continue
+            for i, kind in enumerate(kinds):
+                if kind is None and self.frames[i][col].dtype != text[0]:
+                    self.frames[i] = self.frames[i].assign(**{col: self.frames[i][col].astype(text[0])})
+
+    def close(self) -> pd.DataFrame:
+        """Parse any trailing record and return the combined DataFrame"""
+        self._commit(self._buffer, *self._parse(self._buffer))
+        self._buffer = b''
+        if not self.frames:
+            raise ValueError("No data received")
+
+        # Header-only chunks have no dtypes of their own and would turn every column into object
+        if any(len(frame) for frame in self.frames):
+            kept = [i for i, frame in enumerate(self.frames) if len(frame)]
+            self.frames = [self.frames[i] for i in kept]
+            self._chunks = [self._chunks[i] for i in kept]
+            for profile in self.profiles.values():
+                profile.keep_chunks(kept)
+
+        # Swap in the chunks converted while parsing, as detect_column_types would convert them
+        conflicts = []
+        for col in self.columns:
+            column_type, converted = self.profiles[col].resolve()
+            self.column_types[col] = column_type
+            if column_type is None:
+                conflicts.append(col)
+            elif converted is not None:
+                # All-null chunks become NaN/NaT so they don't turn the column into object
+                missing = pd.NaT if column_type == 'datetime' else np.nan
+                dtype = next(c.dtype for c in converted if c is not None) if column_type == 'datetime' else float
+                for i, frame in enumerate(self.frames):
+                    values = converted[i] if converted[i] is not None else \
+                        pd.Series(missing, index=frame.index, dtype=dtype)
+                    self.frames[i] = frame.assign(**{col: values})
+
+        # Re-read mixed-type columns as text in every chunk, as one read_csv would
+        if conflicts:
+            for i, (data, first) in enumerate(self._chunks):
+                text = self._read(data, first=first, dtype={col: str for col in conflicts})[conflicts]
+                if self.transform is not None:
+                    text = self.transform(text)
+                self.frames[i] = self.frames[i].assign(**{col: text[col] for col in conflicts})
+        self._chunks = []
+        self._align_null_chunks()
+
+        if len(self.frames) == 1:
+            return self.frames[0]
+        return pd.concat(self.frames, ignore_index=not self._index_names)
+
+    def column_summary(self, df: pd.DataFrame) -> Tuple[Dict[str, Optional[str]], Dict[str, Optional[dict]]]:
+        """Column types and get_column_info entries of the frame returned by close()
+
+        Both map each column to None when its chunks parsed as different kinds;
+        those columns still need detection on the combined column.
+        """
+        types, infos = {}, {}
+        for col in self.columns:
+            column_type = self.column_types[col]
+            if column_type == 'bool':
+                # Missing values leave bools as object, which detection treats as text
+                column_type = 'numeric' if pd.api.types.is_bool_dtype(df[col]) else 'categorical'
+            types[col] = column_type
+            infos[col] = self.profiles[col].info(col, df[col], column_type) if column_type else None
+        return types, infos
+
+class ChunkedUpload:
+    """State of one resumable upload
+
+    Parts are numbered from 1 and may arrive in any order or more than once.
+    Contiguous parts are fed to the parser immediately; parts that arrive
+    ahead of a gap wait in memory until the gap is filled.
+    """
+
+    def __init__(self, filename: str, parser: IncrementalCSVParser, total_parts: Optional[int] = None):
+        self.upload_id = str(uuid.uuid4())
+        self.filename = filename
+        self.total_parts = total_parts
+        self.parser = parser
+        self.bytes_received = 0
+        self.last_activity = time.monotonic()
+        self._next_part = 1
+        self._pending: Dict[int, bytes] = {}
+
+    def add_part(self, part_number: int, data: bytes) -> bool:
+        """Add a part; returns False if it had already been received"""
+        if part_number < 1 or (self.total_parts is not None and part_number > self.total_parts):
+            raise ValueError(f"Invalid part number {part_number}")
+        if part_number < self._next_part or part_number in self._pending:
+            return False
+
+        self.last_activity = time.monotonic()
+        self.bytes_received += len(data)
+        self._pending[part_number] = data
+        while self._next_part in self._pending:
+            chunk = self._pending[self._next_part]
+            try:
+                self.parser.feed(chunk)
+            except Exception:
+                # feed() left the parser untouched; forget the part so it can be re-sent
+                del self._pending[self._next_part]
+                self.bytes_received -= len(chunk)
+                raise
+            del self._pending[self._next_part]
+            self._next_part += 1
+        return True
+
+    def received_parts(self) -> List[int]:
+        """Part numbers received so far, in order"""
+        return list(range(1, self._next_part)) + sorted(self._pending)
+
+    def missing_parts(self) -> List[int]:
+        """Part numbers that must still be sent before completing"""
+        last = self.total_parts if self.total_parts is not None else max(self._pending, default=0)
+        return [n for n in range(self._next_part, last + 1) if n not in self._pending]
+
+    def status(self) -> dict:
+        return {
+            "upload_id": self.upload_id,
+            "filename": self.filename,
+            "total_parts": self.total_parts,
+            "received_parts": self.received_parts(),
+            "missing_parts": self.missing_parts(),
+            "bytes_received": self.bytes_received,
+            "rows_parsed": self.parser.rows
+        }
+
+    def finish(self) -> pd.DataFrame:
+        """Parse the remaining bytes and return the full DataFrame"""
+        missing = self.missing_parts()
+        if missing:
+            raise ValueError(f"Upload incomplete, missing parts: {missing}")
+        return self.parser.close()
+
+# In-memory storage: upload_id -> ChunkedUpload
+upload_store: Dict[str, ChunkedUpload] = {}
+
+# Uploads with no new part for this long are discarded
+UPLOAD_TTL_SECONDS = 3600
+
+def expire_uploads() -> int:
+    """Discard abandoned uploads; returns how many were removed"""
+    cutoff = time.monotonic() - UPLOAD_TTL_SECONDS
+    expired = [upload_id for upload_id, upload in upload_store.items() if upload.last_activity < cutoff]
+    for upload_id in expired:
+        del upload_store[upload_id]
+    return len(expired)
+
+def create_upload(filename: str, parser: IncrementalCSVParser, total_parts: Optional[int] = None) -> ChunkedUpload:
+    """Start a new chunked upload"""
+    expire_uploads()
+    upload = ChunkedUpload(filename, parser, total_parts)
+    upload_store[upload.upload_id] = upload
+    return upload
+
+def get_upload(upload_id: str) -> Optional[ChunkedUpload]:
+    """Retrieve an in-progress upload"""
+    expire_uploads()
+    return upload_store.get(upload_id)
+
+def delete_upload(upload_id: str) -> bool:
+    """Discard an in-progress upload"""
+    return upload_store.pop(upload_id, None) is not None
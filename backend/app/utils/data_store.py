@@ -1,21 +1,50 @@
 import pandas as pd
-from typing import Dict, Optional
+from typing import Any, Dict, Hashable, Optional
 
 # In-memory storage: session_id -> pandas DataFrame
 data_store: Dict[str, pd.DataFrame] = {}
 
+# Monotonic version per session, bumped whenever the DataFrame is replaced
+session_versions: Dict[str, int] = {}
+
+# Derived results per session: session_id -> {(version, key): result}
+result_cache: Dict[str, Dict[Hashable, Any]] = {}
+
 def store_dataframe(session_id: str, df: pd.DataFrame) -> None:
     """Store a DataFrame for a given session ID"""
     data_store[session_id] = df
+    session_versions[session_id] = session_versions.get(session_id, 0) + 1
+    # Cached results belong to the previous version of the data
+    result_cache.pop(session_id, None)
 
 def get_dataframe(session_id: str) -> Optional[pd.DataFrame]:
     """Retrieve a DataFrame for a given session ID"""
     return data_store.get(session_id)
 
+def get_session_version(session_id: str) -> int:
+    """Get the current data version of a session (0 if unknown)"""
+    return session_versions.get(session_id, 0)
+
+def get_cached_result(session_id: str, key: Hashable) -> Optional[Any]:
+    """Retrieve a cached result computed on the current session version"""
+    cache = result_cache.get(session_id)
+    if cache is None:
+        return None
+    return cache.get((get_session_version(session_id), key))
+
+def cache_result(session_id: str, key: Hashable, result: Any) -> None:
+    """Cache a result computed on the current session version"""
+    if session_id not in data_store:
+        return
+    cache = result_cache.setdefault(session_id, {})
+    cache[(get_session_version(session_id), key)] = result
+
 def delete_dataframe(session_id: str) -> bool:
     """Delete a DataFrame for a given session ID"""
     if session_id in data_store:
         del data_store[session_id]
+        session_versions.pop(session_id, None)
+        result_cache.pop(session_id, None)
         return True
     return False
 
@@ -25,4 +54,4 @@ def session_exists(session_id: str) -> bool:
 
 def get_all_sessions() -> list:
     """Get all active session IDs"""
-    return list(data_store.keys())
\ No newline at end of file
+    return list(data_store.keys())
@@ -0,0 +1,118 @@
+import pandas as pd
+from typing import BinaryIO, List, Optional, Tuple
+
+# File extension -> format name
+FILE_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.xlsx': 'excel',
+    '.xls': 'excel',
+}
+
+# Formats whose columns carry their own types, so no inference is needed.
+# JSON-lines is not one of them: JSON has no date type, so its text
+# columns still go through value-based detection.
+TYPED_FORMATS = {'parquet', 'feather', 'excel'}
+
+# Excel extension -> reader engine (also the package that must be installed)
+EXCEL_ENGINES = {
+    '.xlsx': 'openpyxl',
+    '.xls': 'xlrd',
+}
+
+JSONL_CHUNK_SIZE = 100000
+
+def get_file_format(filename: str) -> Tuple[Optional[str], str]:
+    """Return (format, extension) for a filename; format is None if unsupported"""
+    dot = filename.rfind('.')
+    extension = filename[dot:].lower() if dot != -1 else ''
+    return FILE_FORMATS.get(extension), extension
+
+class MissingColumnsError(ValueError):
+    """Requested projection names columns the file does not have"""
+
+def check_columns(available: List[str], columns: Optional[List[str]]) -> None:
+    """Raise MissingColumnsError if any requested column is not available"""
+    if columns is None:
+        return
+    missing = [col for col in columns if col not in available]
+    if missing:
+        raise MissingColumnsError(f"Columns not found: {missing}")
+
+def _missing_dependency(name: str, error: ImportError) -> ImportError:
+    return ImportError(f"Reading this file type requires the '{name}' package: {error}")
+
+def read_parquet(file: BinaryIO, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a Parquet file, loading only the requested columns"""
+    try:
+        if columns is not None:
+            import pyarrow.parquet as pq
+            # Only the footer is read to get the schema
+            check_columns(pq.read_schema(file).names, columns)
+            file.seek(0)
+        return pd.read_parquet(file, columns=columns, engine='pyarrow')
+    except ImportError as e:
+        raise _missing_dependency('pyarrow', e)
+
+def read_feather(file: BinaryIO, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a Feather (Arrow IPC) file, loading only the requested columns"""
+    try:
+        if columns is not None:
+            import pyarrow.ipc
+            check_columns(pyarrow.ipc.open_file(file).schema.names, columns)
+            file.seek(0)
+        return pd.read_feather(file, columns=columns)
+    except ImportError as e:
+        raise _missing_dependency('pyarrow', e)
+
+def read_jsonl(file: BinaryIO, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read a JSON-lines file in chunks, keeping only the requested columns"""
+    chunks = []
+    with pd.read_json(file, lines=True, chunksize=JSONL_CHUNK_SIZE) as reader:
+        for chunk in reader:
+            if columns is not None:
+                check_columns(chunk.columns, columns)
+                chunk = chunk[columns]
+            chunks.append(chunk)
+
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+def read_excel(file: BinaryIO, extension: str, columns: Optional[List[str]] = None,
+               na_values: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read the first sheet of an Excel workbook"""
+    try:
+        df = pd.read_excel(file, engine=EXCEL_ENGINES[extension], na_values=na_values)
+    except ImportError as e:
+        raise _missing_dependency(EXCEL_ENGINES[extension], e)
+    # Workbooks are loaded whole anyway, so projecting afterwards costs nothing extra
+    check_columns(df.columns, columns)
+    return df[columns] if columns is not None else df
+
+def column_types_from_schema(df: pd.DataFrame):
+    """Classify columns from their dtypes without inspecting values
+
+    Returns the same (numeric, categorical, datetime) lists as
+    detect_column_types, for files that already carry a schema.
+    """
+    numeric_cols = []
+    categorical_cols = []
+    datetime_cols = []
+
+    for col in df.columns:
+        if df[col].isnull().all():
+            categorical_cols.append(col)
+        elif pd.api.types.is_datetime64_any_dtype(df[col]):
+            datetime_cols.append(col)
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            numeric_cols.append(col)
+        else:
+            categorical_cols.append(col)
+
+    return numeric_cols, categorical_cols, datetime_cols
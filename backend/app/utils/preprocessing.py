@@ -1,12 +1,135 @@
 import pandas as pd
 import numpy as np
+import warnings
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from typing import List, Dict, Any
+from app.utils.serialization import json_value, rows_to_records
 
 def drop_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
     """Drop specified columns from DataFrame"""
     return df.drop(columns=columns, errors='ignore')
 
+IMPUTE_STRATEGIES = ['mean', 'median', 'mode', 'constant', 'ffill', 'bfill', 'group_median']
+
+# Strategies that need a numeric column
+NUMERIC_IMPUTE_STRATEGIES = {'mean', 'median', 'group_median'}
+
+def _replay_value(column: pd.Series, value) -> Any:
+    """Convert a JSON fill value back to the column's type"""
+    if value is not None and pd.api.types.is_datetime64_any_dtype(column):
+        return pd.Timestamp(value)
+    return value
+
+def _column_modes(df: pd.DataFrame, columns: List[str], default: Any = None) -> Dict[str, Any]:
+    """Most frequent non-null value per column, computed once per column"""
+    modes = {}
+    for col in columns:
+        mode = df[col].mode()
+        modes[col] = mode.iloc[0] if not mode.empty else default
+    return modes
+
+def impute_missing_values(df: pd.DataFrame, strategies: Dict[str, Dict[str, Any]]):
+    """Fill missing values with a different strategy per column
+    
+    Statistics are computed in one batched pass per strategy (all 'mean'
+    columns together, one groupby per group key, ...) and scalar fills are
+    applied with a single fillna mapping. Passing back the returned fill
+    values replays the same imputation.
+    
+    Args:
+        df: Input DataFrame
+        strategies: Column -> {'strategy': ..., plus options}:
+            'mean', 'median', 'mode': optional 'value' to reuse a previous fill
+            'constant': 'value'
+            'ffill', 'bfill': no options
+            'group_median': 'group_by' key column, optional 'values' list of
+                {'key': ..., 'value': ...} to reuse a previous fill
+    
+    Returns:
+        (imputed DataFrame, fill values used per column)
+    """
+    by_strategy: Dict[str, List[str]] = {name: [] for name in IMPUTE_STRATEGIES}
+    for col, spec in strategies.items():
+        strategy = spec.get('strategy')
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found")
+        if strategy not in IMPUTE_STRATEGIES:
+            raise ValueError(f"Invalid strategy '{strategy}' for column '{col}'. "
+                             f"Use one of: {', '.join(IMPUTE_STRATEGIES)}")
+        if strategy in NUMERIC_IMPUTE_STRATEGIES and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Strategy '{strategy}' requires a numeric column, '{col}' is not numeric")
+        if strategy == 'constant' and 'value' not in spec:
+            raise ValueError(f"Strategy 'constant' for column '{col}' requires a 'value'")
+        if strategy == 'group_median' and spec.get('group_by') not in df.columns:
+            raise ValueError(f"Strategy 'group_median' for column '{col}' requires an existing 'group_by' column")
+        by_strategy[strategy].append(col)
+    
+    # Scalar fill values, applied together with one fillna call
+    fill_map: Dict[str, Any] = {}
+    for strategy in ('mean', 'median', 'mode', 'constant'):
+        given = [col for col in by_strategy[strategy] if 'value' in strategies[col]]
+        for col in given:
+            fill_map[col] = _replay_value(df[col], strategies[col]['value'])
+        to_compute = [col for col in by_strategy[strategy] if col not in given]
+        if not to_compute:
+            continue
+        if strategy == 'mode':
+            fill_map.update(_column_modes(df, to_compute))
+        else:
+            fill_map.update(getattr(df[to_compute], strategy)().to_dict())
+    
+    fill_values: Dict[str, Dict[str, Any]] = {
+        col: {'strategy': strategies[col]['strategy'], 'value': json_value(value)}
+        for col, value in fill_map.items()
+    }
+    
+    # fillna ignores None, so statistics of all-null columns leave them untouched
+    fill_map = {col: value for col, value in fill_map.items() if value is not None and not pd.isna(value)}
+    result = df.fillna(value=fill_map) if fill_map else df
+    
+    # Row-dependent fills replace only their own columns; the rest stay shared with df
+    row_fills = by_strategy['ffill'] + by_strategy['bfill'] + by_strategy['group_median']
+    if row_fills:
+        result = result.copy(deep=False)
+    
+    for col in by_strategy['ffill']:
+        result[col] = df[col].ffill()
+        fill_values[col] = {'strategy': 'ffill'}
+    for col in by_strategy['bfill']:
+        result[col] = df[col].bfill()
+        fill_values[col] = {'strategy': 'bfill'}
+    
+    # One groupby per key column covers every column grouped by that key
+    group_keys: Dict[str, List[str]] = {}
+    for col in by_strategy['group_median']:
+        group_keys.setdefault(strategies[col]['group_by'], []).append(col)
+    for key, cols in group_keys.items():
+        given = [col for col in cols if 'values' in strategies[col]]
+        to_compute = [col for col in cols if col not in given]
+        medians = df.groupby(key)[to_compute].median() if to_compute else None
+        
+        for col in cols:
+            if col in given:
+                entries = strategies[col]['values']
+                group_values = pd.Series(
+                    [entry['value'] for entry in entries],
+                    index=[_replay_value(df[key], entry['key']) for entry in entries],
+                    dtype=float
+                )
+            else:
+                group_values = medians[col]
+            result[col] = df[col].fillna(df[key].map(group_values))
+            fill_values[col] = {
+                'strategy': 'group_median',
+                'group_by': key,
+                'values': [
+                    {'key': json_value(group), 'value': json_value(value)}
+                    for group, value in group_values.items()
+                ]
+            }
+    
+    return result, fill_values
+
 def handle_missing_values(df: pd.DataFrame, strategy: str = 'mean') -> pd.DataFrame:
     """Handle missing values in DataFrame
     
@@ -14,26 +137,19 @@ def handle_missing_values(df: pd.DataFrame, strategy: str = 'mean') -> pd.DataFr
         df: Input DataFrame
         strategy: 'mean', 'median', 'mode', 'drop', or 'fill_zero'
     """
-    df_copy = df.copy()
-    
     if strategy == 'drop':
-        return df_copy.dropna()
+        return df.dropna()
     elif strategy == 'fill_zero':
-        return df_copy.fillna(0)
-    elif strategy == 'mean':
-        numeric_cols = df_copy.select_dtypes(include=[np.number]).columns
-        df_copy[numeric_cols] = df_copy[numeric_cols].fillna(df_copy[numeric_cols].mean())
-        return df_copy
-    elif strategy == 'median':
-        numeric_cols = df_copy.select_dtypes(include=[np.number]).columns
-        df_copy[numeric_cols] = df_copy[numeric_cols].fillna(df_copy[numeric_cols].median())
-        return df_copy
+        return df.fillna(0)
+    elif strategy in ('mean', 'median'):
+        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        result, _ = impute_missing_values(df, {col: {'strategy': strategy} for col in numeric_cols})
+        return result
     elif strategy == 'mode':
-        for col in df_copy.columns:
-            df_copy[col].fillna(df_copy[col].mode()[0] if not df_copy[col].mode().empty else 0, inplace=True)
-        return df_copy
+        # Columns without any value fall back to 0, as before
+        return df.fillna(value=_column_modes(df, df.columns.tolist(), default=0))
     
-    return df_copy
+    return df.copy()
 
 def one_hot_encode(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
     """Apply one-hot encoding to specified columns - ML Ready with 0 and 1
@@ -97,9 +213,263 @@ def normalize_data(df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
     
     return df_copy
 
-def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
-    """Remove duplicate rows from DataFrame"""
-    return df.drop_duplicates()
+# Default cutoff per outlier method: IQR multiplier, z-score, modified z-score
+OUTLIER_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5}
+
+# Max values loaded into one float block while scanning for outliers (~256 MB)
+OUTLIER_BLOCK_ELEMENTS = 2 ** 25
+
+def _outlier_columns(df: pd.DataFrame, columns: List[str] = None) -> List[str]:
+    """Numeric (non-boolean) columns to check for outliers"""
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+    return [col for col in columns if col in df.columns
+            and pd.api.types.is_numeric_dtype(df[col])
+            and not pd.api.types.is_bool_dtype(df[col])]
+
+def _column_blocks(df: pd.DataFrame, columns: List[str]):
+    """Yield (column names, 2D float array) in blocks of bounded size"""
+    batch = max(1, OUTLIER_BLOCK_ELEMENTS // max(len(df), 1))
+    for start in range(0, len(columns), batch):
+        cols = columns[start:start + batch]
+        yield cols, df[cols].to_numpy(dtype=float, na_value=np.nan)
+
+def _block_quantiles(block: np.ndarray, qs: List[float]) -> np.ndarray:
+    """Linear-interpolated quantiles of every column of a 2D block, ignoring NaN
+
+    The block is sorted once along axis 0 (NaN sorts last) and each quantile
+    is gathered by each column's own non-null count, so all columns are
+    handled in a single vectorized pass instead of one call per column.
+
+    Returns:
+        Array of shape (len(qs), n_columns); NaN for all-null columns
+    """
+    if block.shape[0] == 0:
+        return np.full((len(qs), block.shape[1]), np.nan)
+    ordered = np.sort(block, axis=0)
+    counts = (~np.isnan(block)).sum(axis=0)
+    last = np.maximum(counts - 1, 0)
+    
+    result = np.empty((len(qs), block.shape[1]))
+    for i, q in enumerate(qs):
+        position = q * last
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, last)
+        low = np.take_along_axis(ordered, below[None, :], axis=0)[0]
+        high = np.take_along_axis(ordered, above[None, :], axis=0)[0]
+        result[i] = low + (high - low) * (position - below)
+    result[:, counts == 0] = np.nan
+    return result
+
+def outlier_bounds(df: pd.DataFrame, method: str = 'iqr', columns: List[str] = None,
+                   threshold: float = None) -> Dict[str, Any]:
+    """Compute outlier bounds and counts for numeric columns
+
+    Columns are processed in blocks, each with one vectorized quantile
+    (sort-based, see _block_quantiles) or mean/std computation across all
+    of its columns.
+    
+    Args:
+        df: Input DataFrame
+        method: 'iqr', 'zscore' or 'mad'
+        columns: Columns to check (default: all numeric columns)
+        threshold: Cutoff (default: 1.5 for iqr, 3.0 for zscore, 3.5 for mad)
+    
+    Returns:
+        {'bounds': {col: (lower, upper)}, 'counts': {col: n}, 'row_mask': bool array}
+    """
+    if method not in OUTLIER_THRESHOLDS:
+        raise ValueError(f"Invalid outlier method '{method}'. Use one of: {', '.join(OUTLIER_THRESHOLDS)}")
+    if threshold is None:
+        threshold = OUTLIER_THRESHOLDS[method]
+    
+    columns = _outlier_columns(df, columns)
+    bounds = {}
+    counts = {}
+    row_mask = np.zeros(len(df), dtype=bool)
+    
+    for cols, block in _column_blocks(df, columns):
+        if block.size == 0:
+            break
+        with np.errstate(invalid='ignore'), warnings.catch_warnings():
+            # All-null columns yield NaN bounds and never flag anything
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if method == 'iqr':
+                q1, q3 = _block_quantiles(block, [0.25, 0.75])
+                lower, upper = q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1)
+            elif method == 'zscore':
+                mean, std = np.nanmean(block, axis=0), np.nanstd(block, axis=0, ddof=1)
+                lower, upper = mean - threshold * std, mean + threshold * std
+            else:
+                # Modified z-score: 0.6745 * (x - median) / MAD
+                median = _block_quantiles(block, [0.5])[0]
+                mad = _block_quantiles(np.abs(block - median), [0.5])[0]
+                lower, upper = median - threshold * mad / 0.6745, median + threshold * mad / 0.6745
+            
+            flagged = (block < lower) | (block > upper)
+        row_mask |= flagged.any(axis=1)
+        for i, col in enumerate(cols):
+            bounds[col] = (float(lower[i]), float(upper[i]))
+            counts[col] = int(flagged[:, i].sum())
+    
+    return {'bounds': bounds, 'counts': counts, 'row_mask': row_mask}
+
+def detect_outliers(df: pd.DataFrame, method: str = 'iqr', columns: List[str] = None,
+                    threshold: float = None) -> Dict[str, Any]:
+    """Return per-column outlier bounds and counts without changing the data"""
+    result = outlier_bounds(df, method, columns, threshold)
+    return {
+        'method': method,
+        'threshold': threshold if threshold is not None else OUTLIER_THRESHOLDS[method],
+        'columns': {
+            col: {
+                'lower': lower if np.isfinite(lower) else None,
+                'upper': upper if np.isfinite(upper) else None,
+                'outlier_count': result['counts'][col]
+            }
+            for col, (lower, upper) in result['bounds'].items()
+        },
+        'rows_with_outliers': int(result['row_mask'].sum())
+    }
+
+def handle_outliers(df: pd.DataFrame, method: str = 'iqr', action: str = 'clip',
+                    columns: List[str] = None, threshold: float = None) -> pd.DataFrame:
+    """Clip outliers to their bounds or remove rows containing them
+    
+    Integer columns are clipped to the bounds rounded inward, so they keep
+    their dtype.
+    
+    Args:
+        df: Input DataFrame
+        method: 'iqr', 'zscore' or 'mad'
+        action: 'clip' or 'remove'
+        columns: Columns to check (default: all numeric columns)
+        threshold: Cutoff passed to outlier_bounds
+    """
+    if action not in ('clip', 'remove'):
+        raise ValueError(f"Invalid outlier action '{action}'. Use 'clip' or 'remove'")
+    
+    result = outlier_bounds(df, method, columns, threshold)
+    
+    if action == 'remove':
+        return df[~result['row_mask']]
+    
+    # Only columns that have outliers are rewritten; the rest are shared with df
+    df_copy = df.copy(deep=False)
+    for col, (lower, upper) in result['bounds'].items():
+        if result['counts'][col]:
+            if pd.api.types.is_integer_dtype(df[col]):
+                # Integer bounds keep the dtype (including nullable Int64) and flag the
+                # same values: an integer is below 2.3 exactly when it is below 3
+                lower, upper = int(np.ceil(lower)), int(np.floor(upper))
+            df_copy[col] = df[col].clip(lower=lower, upper=upper)
+    return df_copy
+
+# API keep option -> pandas duplicated() keep argument ('none' drops every copy)
+DUPLICATE_KEEP = {'first': 'first', 'last': 'last', 'none': False}
+
+def row_fingerprints(df: pd.DataFrame, subset: List[str] = None) -> np.ndarray:
+    """64-bit hash of each row over the subset columns (default: all columns)"""
+    if subset:
+        missing = [col for col in subset if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {missing}")
+        df = df[subset]
+    # -0.0 and 0.0 are equal but hash differently; adding 0.0 turns -0.0 into 0.0
+    floats = [col for col in df.columns if pd.api.types.is_float_dtype(df[col])]
+    if floats:
+        df = df.assign(**{col: df[col] + 0.0 for col in floats})
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def _duplicate_candidates(df: pd.DataFrame, fingerprints: np.ndarray, subset: List[str] = None):
+    """Rows whose fingerprint occurs more than once, with their key columns
+    
+    Equal fingerprints only make rows candidates: hashes can collide, and
+    values such as True and 'True' hash alike. Candidates are compared by
+    value before anything is counted or removed.
+    
+    Returns:
+        (candidate row positions, key columns of those rows)
+    """
+    positions = np.flatnonzero(pd.Series(fingerprints).duplicated(keep=False).to_numpy())
+    keys = df[subset] if subset else df
+    return positions, keys.iloc[positions]
+
+def _keep_option(keep: str):
+    if keep not in DUPLICATE_KEEP:
+        raise ValueError(f"Invalid keep option '{keep}'. Use one of: {', '.join(DUPLICATE_KEEP)}")
+    return DUPLICATE_KEEP[keep]
+
+def duplicate_mask(df: pd.DataFrame, fingerprints: np.ndarray, subset: List[str] = None,
+                   keep: str = 'first') -> np.ndarray:
+    """Boolean mask of the rows that removing duplicates would drop"""
+    keep = _keep_option(keep)
+    positions, candidates = _duplicate_candidates(df, fingerprints, subset)
+    mask = np.zeros(len(df), dtype=bool)
+    mask[positions] = candidates.duplicated(keep=keep).to_numpy()
+    return mask
+
+def find_duplicates(df: pd.DataFrame, subset: List[str] = None, keep: str = 'first',
+                    fingerprints: np.ndarray = None, sample_groups: int = 5,
+                    sample_rows: int = 3) -> Dict[str, Any]:
+    """Count duplicates without removing them and show sample duplicate groups
+    
+    Args:
+        df: Input DataFrame
+        subset: Key columns that define a duplicate (default: all columns)
+        keep: 'first', 'last' or 'none'
+        fingerprints: Precomputed row_fingerprints for the same subset
+        sample_groups: Number of largest duplicate groups to return
+        sample_rows: Number of rows shown per sample group
+    """
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df, subset)
+    
+    positions, candidates = _duplicate_candidates(df, fingerprints, subset)
+    mask = np.zeros(len(df), dtype=bool)
+    mask[positions] = candidates.duplicated(keep=_keep_option(keep)).to_numpy()
+    
+    # Group the confirmed duplicates by value, largest groups first
+    confirmed = candidates.duplicated(keep=False).to_numpy()
+    positions, candidates = positions[confirmed], candidates[confirmed]
+    group_ids = np.zeros(len(positions), dtype=np.int64)
+    for i in range(candidates.shape[1]):
+        codes, uniques = pd.factorize(candidates.iloc[:, i], use_na_sentinel=False)
+        group_ids = pd.factorize(group_ids * len(uniques) + codes)[0]
+    group_sizes = np.bincount(group_ids)
+    
+    samples = []
+    for group in np.argsort(-group_sizes, kind='stable')[:sample_groups]:
+        group_positions = positions[group_ids == group][:sample_rows]
+        samples.append({
+            'count': int(group_sizes[group]),
+            'row_positions': group_positions.tolist(),
+            'rows': rows_to_records(candidates[group_ids == group].iloc[:sample_rows])
+        })
+    
+    return {
+        'subset': subset or df.columns.tolist(),
+        'keep': keep,
+        'total_rows': len(df),
+        'duplicate_groups': int(len(group_sizes)),
+        'rows_to_remove': int(mask.sum()),
+        'rows_after': int(len(df) - mask.sum()),
+        'sample_groups': samples
+    }
+
+def remove_duplicates(df: pd.DataFrame, subset: List[str] = None, keep: str = 'first',
+                      fingerprints: np.ndarray = None) -> pd.DataFrame:
+    """Remove duplicate rows from DataFrame
+    
+    Args:
+        df: Input DataFrame
+        subset: Key columns that define a duplicate (default: all columns)
+        keep: 'first', 'last' or 'none' (drop every copy)
+        fingerprints: Precomputed row_fingerprints for the same subset
+    """
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df, subset)
+    return df[~duplicate_mask(df, fingerprints, subset, keep)]
 
 def get_column_info(df: pd.DataFrame) -> Dict[str, Any]:
     """Get detailed information about DataFrame columns"""
@@ -0,0 +1,250 @@
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any, Optional
+from app.utils.data_store import get_cached_result, cache_result
+from app.utils.serialization import rows_to_records
+
+try:
+    import numexpr
+except ImportError:  # numexpr is optional; plain NumPy is used without it
+    numexpr = None
+
+RANGE_OPS = {'lt', 'le', 'gt', 'ge', 'between'}
+EQUALITY_OPS = {'eq', 'in'}
+SCAN_OPS = {'ne', 'not_in', 'is_null', 'not_null', 'contains'}
+OPERATORS = RANGE_OPS | EQUALITY_OPS | SCAN_OPS
+
+# Below this many rows numexpr's setup cost outweighs its speedup
+NUMEXPR_MIN_ROWS = 100000
+
+NUMEXPR_OPS = {'lt': '<', 'le': '<=', 'gt': '>', 'ge': '>=', 'eq': '==', 'ne': '!='}
+
+NUMPY_OPS = {
+    'lt': np.less, 'le': np.less_equal, 'gt': np.greater,
+    'ge': np.greater_equal, 'eq': np.equal, 'ne': np.not_equal
+}
+
+MAX_PAGE_SIZE = 1000
+
+class SortedIndex:
+    """Row positions of the non-null values of a numeric or datetime column, in value order"""
+
+    def __init__(self, values: np.ndarray, valid: np.ndarray):
+        positions = np.flatnonzero(valid)
+        order = np.argsort(values[positions], kind='stable')
+        self.positions = positions[order]
+        self.sorted_values = values[self.positions]
+
+    def slice(self, low=None, high=None, low_inclusive=True, high_inclusive=True) -> tuple:
+        """(start, stop) into positions for low <(=) value <(=) high"""
+        start = 0 if low is None else int(np.searchsorted(
+            self.sorted_values, low, side='left' if low_inclusive else 'right'))
+        stop = len(self.sorted_values) if high is None else int(np.searchsorted(
+            self.sorted_values, high, side='right' if high_inclusive else 'left'))
+        return start, max(start, stop)
+
+    def slices(self, op: str, values: List[Any]) -> List[tuple]:
+        if op in EQUALITY_OPS:
+            return [self.slice(v, v) for v in values]
+        if op == 'between':
+            return [self.slice(values[0], values[1])]
+        if op in ('gt', 'ge'):
+            return [self.slice(low=values[0], low_inclusive=op == 'ge')]
+        return [self.slice(high=values[0], high_inclusive=op == 'le')]
+
+    def rows(self, slices: List[tuple]) -> np.ndarray:
+        return np.sort(np.concatenate([self.positions[a:b] for a, b in slices]))
+
+class CategoryIndex:
+    """Row positions of each distinct value of a column, grouped by category code
+
+    Works like one bitmap per category, stored as the list of matching rows.
+    """
+
+    def __init__(self, column: pd.Series):
+        codes, uniques = pd.factorize(column)
+        self.lookup = {value: code for code, value in enumerate(uniques)}
+        # A stable sort keeps the positions of each code in ascending row order
+        self.order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+        self.starts = np.concatenate([[0], np.cumsum(counts)])
+
+    def slices(self, op: str, values: List[Any]) -> List[tuple]:
+        result = []
+        for value in values:
+            code = self.lookup.get(value)
+            if code is not None:
+                # Slot 0 holds missing values (code -1), so code c lives in slot c + 1
+                result.append((int(self.starts[code + 1]), int(self.starts[code + 2])))
+        return result
+
+    def rows(self, slices: List[tuple]) -> np.ndarray:
+        if len(slices) == 1:
+            a, b = slices[0]
+            return self.order[a:b]
+        return np.sort(np.concatenate([self.order[a:b] for a, b in slices]))
+
+def _is_ordered(column: pd.Series) -> bool:
+    return (pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)) \
+        or pd.api.types.is_datetime64_any_dtype(column)
+
+def _column_values(column: pd.Series):
+    """Return (comparable values, non-null mask) for an ordered column"""
+    valid = column.notna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(column):
+        values = column.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    else:
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+    return values, valid
+
+def _coerce(column: pd.Series, value):
+    """Convert a JSON predicate value to the column's comparable type"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return pd.Timestamp(value).value
+    if _is_ordered(column):
+        return float(value)
+    return value
+
+def get_index(session_id: str, df: pd.DataFrame, column: str):
+    """Return the column's index, building it on first use
+
+    Indexes live in the session result cache, so they are dropped as soon
+    as the session's data changes.
+    """
+    key = ("index", column)
+    index = get_cached_result(session_id, key)
+    if index is None:
+        if _is_ordered(df[column]):
+            index = SortedIndex(*_column_values(df[column]))
+        else:
+            index = CategoryIndex(df[column])
+        cache_result(session_id, key, index)
+    return index
+
+def _predicate_values(column: pd.Series, op: str, value) -> List[Any]:
+    """Predicate value(s) as a de-duplicated list in the column's comparable type"""
+    values = value if op in ('in', 'not_in', 'between') else [value]
+    coerced = [_coerce(column, v) for v in values]
+    return coerced if op == 'between' else list(dict.fromkeys(coerced))
+
+def _predicate_mask(column: pd.Series, op: str, value) -> np.ndarray:
+    """Evaluate a predicate over every value of column as a boolean mask"""
+    if op == 'is_null':
+        return column.isna().to_numpy()
+    if op == 'not_null':
+        return column.notna().to_numpy()
+    if op == 'contains':
+        return column.astype(str).str.contains(str(value), case=False, regex=False).to_numpy(dtype=bool) \
+            & column.notna().to_numpy()
+
+    values = _predicate_values(column, op, value)
+    if not _is_ordered(column):
+        if op in ('eq', 'in', 'ne', 'not_in'):
+            mask = column.isin(values).to_numpy(dtype=bool)
+            return ~mask if op in ('ne', 'not_in') else mask
+        raise ValueError(f"Operator '{op}' requires a numeric or datetime column")
+
+    data, valid = _column_values(column)
+    if op in ('in', 'not_in'):
+        mask = np.isin(data, values, invert=op == 'not_in')
+    elif op == 'between':
+        mask = (data >= values[0]) & (data <= values[1])
+    elif numexpr is not None and len(data) >= NUMEXPR_MIN_ROWS:
+        mask = numexpr.evaluate(f"data {NUMEXPR_OPS[op]} bound",
+                                local_dict={"data": data, "bound": values[0]})
+    else:
+        mask = NUMPY_OPS[op](data, values[0])
+    # Missing values never match, except for the negated operators
+    return mask | ~valid if op in ('ne', 'not_in') else mask & valid
+
+def validate_filters(df: pd.DataFrame, filters: List[Dict[str, Any]]) -> None:
+    for f in filters:
+        column, op = f.get('column'), f.get('op')
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found")
+        if op not in OPERATORS:
+            raise ValueError(f"Invalid operator '{op}'. Use one of: {', '.join(sorted(OPERATORS))}")
+        value = f.get('value')
+        if op in ('in', 'not_in') and not isinstance(value, list):
+            raise ValueError(f"Operator '{op}' requires a list value")
+        if op == 'between' and (not isinstance(value, list) or len(value) != 2):
+            raise ValueError("Operator 'between' requires a [low, high] value")
+        if op in RANGE_OPS and not _is_ordered(df[column]):
+            raise ValueError(f"Operator '{op}' requires a numeric or datetime column")
+        if op not in ('is_null', 'not_null') and value is None:
+            raise ValueError(f"Operator '{op}' requires a value")
+
+def filter_rows(session_id: str, df: pd.DataFrame, filters: List[Dict[str, Any]]) -> np.ndarray:
+    """Return the sorted row positions matching all filters (AND)
+
+    Match counts of indexable predicates (eq, in and range operators) are
+    read from the column indexes without touching the rows. Only the most
+    selective one is materialized; the other predicates are then evaluated
+    as vectorized masks on those candidate rows.
+    """
+    validate_filters(df, filters)
+    if not filters:
+        return np.arange(len(df))
+
+    best = None
+    for i, f in enumerate(filters):
+        if f['op'] in RANGE_OPS or f['op'] in EQUALITY_OPS:
+            column = df[f['column']]
+            index = get_index(session_id, df, f['column'])
+            slices = index.slices(f['op'], _predicate_values(column, f['op'], f.get('value')))
+            count = sum(b - a for a, b in slices)
+            if best is None or count < best[0]:
+                best = (count, i, index, slices)
+
+    if best is None:
+        mask = np.ones(len(df), dtype=bool)
+        for f in filters:
+            mask &= _predicate_mask(df[f['column']], f['op'], f.get('value'))
+        return np.flatnonzero(mask)
+
+    count, chosen, index, slices = best
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+    positions = index.rows(slices)
+    remaining = [f for i, f in enumerate(filters) if i != chosen]
+    if not remaining:
+        return positions
+
+    # Only the columns the remaining predicates read are gathered for the candidates
+    subset = df[list(dict.fromkeys(f['column'] for f in remaining))].iloc[positions]
+    mask = np.ones(len(positions), dtype=bool)
+    for f in remaining:
+        mask &= _predicate_mask(subset[f['column']], f['op'], f.get('value'))
+    return positions[mask]
+
+def query_rows(session_id: str, df: pd.DataFrame, filters: List[Dict[str, Any]],
+               columns: Optional[List[str]] = None, offset: int = 0,
+               limit: int = 100):
+    """Filter rows and return the match count with one page of projected rows
+
+    Returns:
+        (response dict, all matching row positions)
+    """
+    if columns:
+        missing = [col for col in columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {missing}")
+    else:
+        columns = df.columns.tolist()
+    if offset < 0:
+        raise ValueError("offset must be non-negative")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    positions = filter_rows(session_id, df, filters)
+    page = positions[offset:offset + limit]
+
+    result = {
+        "match_count": int(len(positions)),
+        "total_rows": len(df),
+        "offset": offset,
+        "limit": limit,
+        "columns": columns,
+        "rows": rows_to_records(df[columns].iloc[page])
+    }
+    return result, positions
@@ -0,0 +1,39 @@
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any
+
+def json_value(value) -> Any:
+    """Convert a scalar to a JSON-safe Python value, keeping its type"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(value) if np.isfinite(value) else None
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    return str(value)
+
+def json_floats(values: np.ndarray) -> List[Any]:
+    """Convert a float array to a list with None in place of NaN/inf"""
+    values = np.asarray(values, dtype=float)
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+def _record_value(value) -> Any:
+    """Preview cell format: numbers as floats, everything else as text"""
+    if pd.isna(value):
+        return None
+    if isinstance(value, (np.integer, np.floating, int, float)) and not isinstance(value, bool):
+        value = float(value)
+        return value if np.isfinite(value) else None
+    return str(value)
+
+def rows_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert rows to JSON-safe records, matching the preview format"""
+    columns = df.columns.tolist()
+    return [
+        {col: _record_value(value) for col, value in zip(columns, row)}
+        for row in df.itertuples(index=False, name=None)
+    ]
@@ -0,0 +1,196 @@
+import pandas as pd
+import numpy as np
+import math
+from typing import List, Dict, Any
+from app.utils.serialization import json_floats
+
+# Bucket name -> pandas offset alias, ordered from finest to coarsest
+BUCKETS = {
+    'minute': 'min',
+    'hour': 'h',
+    'day': 'D',
+    'week': 'W',
+    'month': 'MS',
+    'quarter': 'QS',
+    'year': 'YS',
+}
+
+# Shortest length of each bucket, used to estimate bucket counts for 'auto'
+BUCKET_WIDTHS = {
+    'minute': pd.Timedelta(minutes=1),
+    'hour': pd.Timedelta(hours=1),
+    'day': pd.Timedelta(days=1),
+    'week': pd.Timedelta(weeks=1),
+    'month': pd.Timedelta(days=28),
+    'quarter': pd.Timedelta(days=90),
+    'year': pd.Timedelta(days=365),
+}
+
+AGGREGATIONS = ['sum', 'mean', 'min', 'max']
+
+MAX_POINTS_LIMIT = 10000
+
+def _json_times(times, tz=None) -> List[str]:
+    """Convert datetime values to ISO 8601 strings
+
+    tz: timezone of the source column when times are naive UTC values
+    """
+    index = pd.DatetimeIndex(times)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    return [ts.isoformat() for ts in index]
+
+def _prepare_frame(df: pd.DataFrame, time_column: str, value_columns: List[str]) -> pd.DataFrame:
+    """Validate columns and return the time/value projection sorted by time"""
+    if time_column not in df.columns:
+        raise ValueError(f"Column '{time_column}' not found")
+    if not pd.api.types.is_datetime64_any_dtype(df[time_column]):
+        raise ValueError(f"Column '{time_column}' is not a datetime column")
+    if not value_columns:
+        raise ValueError("At least one value column is required")
+    for col in value_columns:
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found")
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Column '{col}' is not numeric")
+
+    # Only the needed columns are copied, never the whole frame
+    frame = df[[time_column] + value_columns]
+    frame = frame[frame[time_column].notna()]
+    if not frame[time_column].is_monotonic_increasing:
+        frame = frame.sort_values(time_column, kind='stable')
+    return frame
+
+def choose_bucket(start: pd.Timestamp, end: pd.Timestamp, max_points: int) -> str:
+    """Pick the finest bucket whose number of intervals fits in max_points
+
+    If even yearly buckets are too many, returns a fixed-width frequency
+    (e.g. '6311520000s') just wide enough to fit.
+    """
+    span = end - start
+    for name, width in BUCKET_WIDTHS.items():
+        # +2 covers partial buckets at both ends
+        if span // width + 2 <= max_points:
+            return name
+    return f"{math.ceil(span.total_seconds() / (max_points - 2))}s"
+
+def resample_timeseries(df: pd.DataFrame, time_column: str, value_columns: List[str],
+                        bucket: str = 'auto', agg: str = 'mean',
+                        max_points: int = 1000) -> Dict[str, Any]:
+    """Aggregate value columns into fixed time buckets
+
+    Args:
+        df: Input DataFrame
+        time_column: Datetime column used for bucketing
+        value_columns: Numeric columns to aggregate
+        bucket: 'minute', 'hour', 'day', 'week', 'month', 'quarter', 'year'
+            or 'auto', which always fits in max_points
+        agg: 'sum', 'mean', 'min' or 'max'
+        max_points: Maximum number of buckets in the response
+    """
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Invalid aggregation '{agg}'. Use one of: {', '.join(AGGREGATIONS)}")
+    if bucket != 'auto' and bucket not in BUCKETS:
+        raise ValueError(f"Invalid bucket '{bucket}'. Use 'auto' or one of: {', '.join(BUCKETS)}")
+
+    frame = _prepare_frame(df, time_column, value_columns)
+    if frame.empty:
+        return {"bucket": None, "points": 0, "counts": [],
+                "series": {col: {"times": [], "values": []} for col in value_columns}}
+
+    start, end = frame[time_column].iloc[0], frame[time_column].iloc[-1]
+    if bucket == 'auto':
+        bucket = choose_bucket(start, end, max_points)
+
+    if bucket in BUCKETS:
+        resampler = frame.set_index(time_column)[value_columns].resample(BUCKETS[bucket])
+    else:
+        # Fixed-width buckets start at the first timestamp so the count stays within max_points
+        resampler = frame.set_index(time_column)[value_columns].resample(bucket, origin='start')
+    counts = resampler.size()
+    if len(counts) > max_points:
+        raise ValueError(
+            f"Bucket '{bucket}' produces {len(counts)} points, more than max_points={max_points}. "
+            f"Use a coarser bucket or 'auto'."
+        )
+
+    if agg == 'sum':
+        # Empty buckets stay null instead of becoming 0
+        result = resampler.sum(min_count=1)
+    else:
+        result = getattr(resampler, agg)()
+
+    times = _json_times(result.index)
+    return {
+        "bucket": bucket,
+        "points": len(result),
+        "counts": counts.astype(int).tolist(),
+        "series": {
+            col: {
+                "times": times,
+                "values": json_floats(result[col].to_numpy(dtype=float, na_value=np.nan))
+            }
+            for col in value_columns
+        }
+    }
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of the points to keep
+
+    x must be sorted ascending and neither array may contain NaN.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points are split into threshold - 2 buckets; first and last are always kept
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point for the final bucket)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = stop if i + 2 < len(edges) else n - 1
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+
+        bucket_x = x[start:stop]
+        bucket_y = y[start:stop]
+        areas = np.abs((x[a] - avg_x) * (bucket_y - y[a]) - (x[a] - bucket_x) * (avg_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+
+    return selected
+
+def downsample_timeseries(df: pd.DataFrame, time_column: str, value_columns: List[str],
+                          max_points: int = 1000) -> Dict[str, Any]:
+    """Downsample each value column to at most max_points with LTTB
+
+    Each column keeps its own points, so times are returned per series.
+    """
+    frame = _prepare_frame(df, time_column, value_columns)
+    # Arrays are naive UTC; tz-aware columns are converted back when serializing
+    tz = getattr(frame[time_column].dtype, 'tz', None)
+    times = frame[time_column].to_numpy(dtype='datetime64[ns]')
+    x_all = times.astype(np.int64).astype(float)
+
+    series = {}
+    for col in value_columns:
+        y = frame[col].to_numpy(dtype=float, na_value=np.nan)
+        valid = ~np.isnan(y)
+        x, y, t = x_all[valid], y[valid], times[valid]
+        keep = lttb_indices(x, y, max_points)
+        series[col] = {
+            "times": _json_times(t[keep], tz),
+            "values": json_floats(y[keep])
+        }
+
+    return {
+        "points": max((len(s["values"]) for s in series.values()), default=0),
+        "source_rows": len(frame),
+        "series": series
+    }
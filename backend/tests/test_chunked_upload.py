@@ -0,0 +1,173 @@
+import io
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes.upload import CSV_NA_VALUES, handle_null_representations
+from app.utils.data_store import get_dataframe
+from app.utils import chunked_upload
+from app.utils.chunked_upload import IncrementalCSVParser, ChunkedUpload
+
+client = TestClient(app)
+
+QUOTED_CSV = (
+    b'id,text,value\n'
+    b'1,"line one\nline two",1.5\n'
+    b'2,"has ""quotes"", and comma",2\n'
+    b'3,"",\n'
+    b'4,"ends with newline\n",4.25\n'
+    b'5,plain,5'
+)
+
+def make_parser():
+    return IncrementalCSVParser(
+        transform=handle_null_representations,
+        na_values=CSV_NA_VALUES,
+        keep_default_na=True
+    )
+
+def read_whole(data: bytes) -> pd.DataFrame:
+    df = pd.read_csv(io.BytesIO(data), na_values=CSV_NA_VALUES, keep_default_na=True)
+    return handle_null_representations(df)
+
+def parse_in_parts(data: bytes, part_size: int) -> pd.DataFrame:
+    parser = make_parser()
+    for i in range(0, len(data), part_size):
+        parser.feed(data[i:i + part_size])
+    return parser.close()
+
+@pytest.mark.parametrize("part_size", [1, 2, 3, 5, 7, 11, 16, 1000])
+def test_quoted_newlines_across_part_boundaries(part_size):
+    result = parse_in_parts(QUOTED_CSV, part_size)
+    pd.testing.assert_frame_equal(result, read_whole(QUOTED_CSV))
+
+def test_every_two_way_split_matches_read_csv():
+    expected = read_whole(QUOTED_CSV)
+    for split in range(len(QUOTED_CSV) + 1):
+        parser = make_parser()
+        parser.feed(QUOTED_CSV[:split])
+        parser.feed(QUOTED_CSV[split:])
+        pd.testing.assert_frame_equal(parser.close(), expected)
+
+def test_row_with_extra_fields_raises_like_read_csv():
+    parser = make_parser()
+    parser.feed(b'a,b\n1,2\n')
+    with pytest.raises(pd.errors.ParserError):
+        parser.feed(b'9,8,3,4\n5,6,7,8\n')
+    with pytest.raises(pd.errors.ParserError):
+        read_whole(b'a,b\n1,2\n9,8,3,4\n5,6,7,8\n')
+
+def test_failed_feed_leaves_parser_unchanged():
+    parser = make_parser()
+    parser.feed(b'a,b\n1,2\n3,')
+    with pytest.raises(pd.errors.ParserError):
+        parser.feed(b'4,5,6\n')
+    assert parser.rows == 1
+    parser.feed(b'4\n')
+    pd.testing.assert_frame_equal(parser.close(), read_whole(b'a,b\n1,2\n3,4\n'))
+
+def test_failed_part_is_not_counted_and_can_be_resent():
+    upload = ChunkedUpload('f.csv', make_parser(), total_parts=2)
+    upload.add_part(1, b'a,b\n1,2\n')
+    with pytest.raises(pd.errors.ParserError):
+        upload.add_part(2, b'1,2,3\n')
+    assert upload.bytes_received == 8
+    assert upload.missing_parts() == [2]
+    assert upload.add_part(2, b'3,4\n')
+    assert upload.bytes_received == 12
+    assert upload.finish()['a'].tolist() == [1, 3]
+
+def test_mixed_type_column_matches_read_csv():
+    data = b'x,y\n' + b''.join(f'{i},{i}.0\n'.encode() for i in range(50)) + b'abc,1\n'
+    result = parse_in_parts(data, 64)
+    expected = read_whole(data)
+    pd.testing.assert_frame_equal(result, expected)
+    assert result['x'].tolist()[:2] == ['0', '1']
+
+def test_wide_first_row_keeps_implicit_index():
+    data = b'a,b\n1,2,3\n4,5,6\n7,8,9\n'
+    pd.testing.assert_frame_equal(parse_in_parts(data, 10), read_whole(data))
+
+def test_out_of_order_parts_and_resume_status():
+    upload = ChunkedUpload('f.csv', make_parser(), total_parts=3)
+    parts = [QUOTED_CSV[:20], QUOTED_CSV[20:50], QUOTED_CSV[50:]]
+    upload.add_part(3, parts[2])
+    upload.add_part(1, parts[0])
+    assert upload.missing_parts() == [2]
+    assert upload.add_part(1, parts[0]) is False
+    upload.add_part(2, parts[1])
+    pd.testing.assert_frame_equal(upload.finish(), read_whole(QUOTED_CSV))
+
+def test_abandoned_uploads_expire(monkeypatch):
+    upload = chunked_upload.create_upload('f.csv', make_parser())
+    upload.last_activity = time.monotonic() - chunked_upload.UPLOAD_TTL_SECONDS - 1
+    assert chunked_upload.get_upload(upload.upload_id) is None
+
+def upload_both_ways(data: bytes, part_size: int):
+    """(summary, frame) of a single /upload and of a chunked upload of the same bytes"""
+    single = client.post('/api/upload', files={'file': ('f.csv', data, 'text/csv')}).json()
+
+    parts = [data[i:i + part_size] for i in range(0, len(data), part_size)]
+    upload_id = client.post('/api/upload/init', json={'filename': 'f.csv', 'total_parts': len(parts)}).json()['upload_id']
+    for number in reversed(range(1, len(parts) + 1)):
+        assert client.put(f'/api/upload/{upload_id}/parts/{number}', content=parts[number - 1]).status_code == 200
+    chunked = client.post(f'/api/upload/{upload_id}/complete').json()
+
+    frames = [get_dataframe(summary.pop('session_id')) for summary in (single, chunked)]
+    return (single, frames[0]), (chunked, frames[1])
+
+def assert_same_upload(data: bytes, part_size: int):
+    (expected, expected_df), (result, result_df) = upload_both_ways(data, part_size)
+    assert result == expected
+    pd.testing.assert_frame_equal(result_df, expected_df)
+    return result
+
+def test_complete_returns_upload_csv_summary():
+    rng = np.random.default_rng(0)
+    n = 2000
+    df = pd.DataFrame({
+        'a': rng.integers(0, 100, n),
+        'b': rng.normal(size=n),
+        'c': rng.choice(['x', 'N/A', 'multi\nline "q"'], n),
+        'd': pd.date_range('2020', periods=n, freq='h').astype(str),
+    })
+    assert_same_upload(df.to_csv(index=False).encode(), 997)
+
+TYPE_CASES = {
+    # Numbers with thousands separators are text to read_csv, numeric after detection
+    'thousands': b'x,y\n' + b'"1,234",a\n' * 30 + b',\n' * 30 + b'"2,000.5",b\n' * 3,
+    # Dates with a chunk of nothing but empty cells
+    'dates': b'x,y\n' + b'2021-03-04 05:06:07,1\n' * 30 + b',2\n' * 40 + b'2022-01-01 00:00:00,3\n' * 5,
+    # Numbers first, a word at the end: re-read as text, detected as categorical
+    'late_text': b'x,y\n' + b'1,2\n' * 100 + b'oops,3\n',
+    # Text that converts to numbers until the last chunk, and to dates throughout
+    'numbers_then_dates': b'x\n' + b'"1,2,2021"\n' * 30 + b'Jan 5 2021\n' * 5,
+    'bools': b'x,y\n' + b'True,False\n' * 40 + b'False,\n' * 40,
+}
+
+@pytest.mark.parametrize('name', TYPE_CASES)
+def test_complete_detects_types_like_upload_csv(name):
+    assert_same_upload(TYPE_CASES[name], 64)
+
+def test_unique_counts_past_the_tracking_cap(monkeypatch):
+    monkeypatch.setattr(chunked_upload, 'MAX_TRACKED_UNIQUES', 50)
+    data = b'x,y\n' + b''.join(f'{i},{i % 7}\n'.encode() for i in range(500))
+    result = assert_same_upload(data, 128)
+    assert [info['unique_count'] for info in result['column_info']['columns']] == [500, 7]
+
+def test_malformed_part_drops_upload():
+    upload_id = client.post('/api/upload/init', json={'filename': 'f.csv'}).json()['upload_id']
+    client.put(f'/api/upload/{upload_id}/parts/1', content=b'a,b\n1,2\n')
+    response = client.put(f'/api/upload/{upload_id}/parts/2', content=b'1,2,3\n')
+    assert response.status_code == 400
+    assert client.get(f'/api/upload/{upload_id}').status_code == 404
+
+def test_bool_column_with_empty_cell_stays_bool():
+    data = b'a,b\n' + b'True,1\n' * 10 + b'False,2\n' * 10 + b',3\nTrue,4\n'
+    result = parse_in_parts(data, 8)
+    pd.testing.assert_frame_equal(result, read_whole(data))
+    assert result['a'].iloc[0] is True
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.preprocessing import find_duplicates, remove_duplicates, row_fingerprints
+
+@pytest.fixture
+def df():
+    # True/'True' and 1.5/'1.5' hash to the same fingerprint but are different values
+    return pd.DataFrame({
+        'a': [True, 'True', 1.5, '1.5', 1.5, None, None, 'x'],
+        'b': [1, 1, 2, 2, 2, 3, 3, 4],
+    })
+
+@pytest.fixture(params=['mixed', 'signed_zero'])
+def frame(request, df):
+    if request.param == 'signed_zero':
+        # Equal values that hash differently
+        return pd.DataFrame({'a': [0.0, -0.0, 1.0, -0.0], 'b': [1, 1, 2, 1]})
+    return df
+
+@pytest.mark.parametrize('keep, pandas_keep', [('first', 'first'), ('last', 'last'), ('none', False)])
+def test_remove_matches_drop_duplicates(frame, keep, pandas_keep):
+    assert remove_duplicates(frame, keep=keep).equals(frame.drop_duplicates(keep=pandas_keep))
+
+def test_find_counts_only_equal_rows(df):
+    result = find_duplicates(df)
+    assert result['duplicate_groups'] == 2
+    assert result['rows_to_remove'] == int(df.duplicated().sum())
+    assert [group['row_positions'] for group in result['sample_groups']] == [[2, 4], [5, 6]]
+
+def test_colliding_fingerprints_are_confirmed_by_value(df):
+    fingerprints = np.zeros(len(df), dtype=np.uint64)
+    assert remove_duplicates(df, fingerprints=fingerprints).equals(df.drop_duplicates())
+    assert find_duplicates(df, fingerprints=fingerprints)['duplicate_groups'] == 2
+
+def test_subset(df):
+    result = find_duplicates(df, subset=['b'], fingerprints=row_fingerprints(df, ['b']))
+    assert result['rows_to_remove'] == int(df.duplicated(subset=['b']).sum())
+    assert list(result['sample_groups'][0]['rows'][0]) == ['b']
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.aggregation import groupby_aggregate
+
+AGGREGATIONS = {'v': ['count', 'sum', 'mean', 'min', 'max', 'median', 'q90']}
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 5000
+    v = rng.normal(size=n)
+    v[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        'a': rng.choice(['x', 'y', 'z', None], n, p=[0.5, 0.3, 0.15, 0.05]),
+        'b': rng.choice([1.0, 2.0, np.nan], n),
+        'c': rng.choice([True, False], n),
+        'v': v,
+    })
+
+def key_of(labels):
+    return tuple(None if pd.isna(label) else label for label in labels)
+
+def expected_groups(df, keys):
+    grouped = df.groupby(keys, dropna=False)['v']
+    frame = grouped.agg(['count', 'sum', 'mean', 'min', 'max'])
+    frame['median'] = grouped.median()
+    frame['q90'] = grouped.quantile(0.9)
+    frame['size'] = grouped.size()
+    return {key_of(labels if isinstance(labels, tuple) else (labels,)): row
+            for labels, row in frame.iterrows()}
+
+def check_row(row, expected):
+    assert row['count'] == expected['size']
+    for name in AGGREGATIONS['v']:
+        value = row[f'v_{name}']
+        if pd.isna(expected[name]):
+            assert value is None
+        else:
+            assert value == pytest.approx(expected[name])
+
+@pytest.mark.parametrize('keys', [['a', 'b'], ['a', 'b', 'c'], ['c', 'b', 'a']])
+def test_matches_pandas_groupby(df, keys):
+    result = groupby_aggregate(df, keys, AGGREGATIONS)
+    expected = expected_groups(df, keys)
+    assert result['total_groups'] == len(expected)
+    assert result['other'] is None
+    assert {key_of(row[k] for k in keys) for row in result['groups']} == set(expected)
+    for row in result['groups']:
+        check_row(row, expected[key_of(row[k] for k in keys)])
+    counts = [row['count'] for row in result['groups']]
+    assert counts == sorted(counts, reverse=True)
+
+@pytest.mark.parametrize('top_n', [1, 3, 7])
+def test_top_n_folds_the_rest_into_other(df, top_n):
+    keys = ['a', 'b']
+    result = groupby_aggregate(df, keys, AGGREGATIONS, top_n=top_n)
+    expected = expected_groups(df, keys)
+    assert len(result['groups']) == top_n
+    for row in result['groups']:
+        check_row(row, expected[key_of(row[k] for k in keys)])
+
+    other = result['other']
+    assert other['group_count'] == len(expected) - top_n
+    assert other['count'] + sum(row['count'] for row in result['groups']) == len(df)
+
+    kept = {key_of(row[k] for k in keys) for row in result['groups']}
+    rest = df[[key_of(labels) not in kept for labels in zip(df['a'], df['b'])]]['v']
+    assert other['v_count'] == rest.count()
+    assert other['v_sum'] == pytest.approx(rest.sum())
+    assert other['v_max'] == pytest.approx(rest.max())
+    assert other['v_median'] == pytest.approx(rest.median())
+
+def test_count_only_on_text_column(df):
+    result = groupby_aggregate(df, ['c'], {'a': ['count']})
+    expected = df.groupby('c')['a'].count()
+    assert {row['c']: row['a_count'] for row in result['groups']} == expected.to_dict()
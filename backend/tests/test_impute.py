@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.data_store import get_dataframe, store_dataframe
+
+client = TestClient(app)
+
+def make_session(session_id: str) -> None:
+    store_dataframe(session_id, pd.DataFrame({'x': [1.0, np.nan, 3.0], 'g': ['a', 'a', 'b']}))
+
+def test_impute_counts_nulls():
+    make_session('impute-ok')
+    response = client.post('/api/impute', json={
+        'session_id': 'impute-ok', 'strategies': {'x': {'strategy': 'mean'}}
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body['fill_values']['x']['value'] == 2.0
+    assert (body['original_null_count'], body['new_null_count']) == (1, 0)
+
+def test_impute_unknown_column_is_rejected():
+    make_session('impute-missing')
+    response = client.post('/api/impute', json={
+        'session_id': 'impute-missing', 'strategies': {'nope': {'strategy': 'mean'}}
+    })
+    assert response.status_code == 400
+    assert 'nope' in response.json()['detail']
+    assert get_dataframe('impute-missing')['x'].isnull().sum() == 1
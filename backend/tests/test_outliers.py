@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.preprocessing import _block_quantiles, detect_outliers, handle_outliers
+
+def test_block_quantiles_match_nanquantile():
+    rng = np.random.default_rng(0)
+    block = rng.normal(size=(1001, 6))
+    block[rng.random(block.shape) < 0.2] = np.nan
+    block[:, 2] = np.nan
+    block[:-1, 3] = np.nan
+    qs = [0.0, 0.25, 0.5, 0.75, 1.0]
+    with np.errstate(invalid='ignore'):
+        expected = np.nanquantile(block, qs, axis=0)
+    np.testing.assert_allclose(_block_quantiles(block, qs), expected, equal_nan=True)
+
+def test_clip_keeps_integer_dtypes():
+    df = pd.DataFrame({
+        'nullable': pd.array(list(range(1, 100)) + [1000, None], dtype='Int64'),
+        'plain': np.r_[np.arange(1, 100), 1000, -500],
+    })
+    result = handle_outliers(df, method='iqr', action='clip')
+    assert result['nullable'].dtype == 'Int64'
+    assert result['plain'].dtype == np.int64
+    bounds = detect_outliers(df)['columns']['plain']
+    assert bounds['lower'] <= result['plain'].min() and result['plain'].max() <= bounds['upper']
+
+def test_remove_drops_flagged_rows():
+    df = pd.DataFrame({'x': np.r_[np.arange(100.0), 1e6], 'y': np.arange(101.0)})
+    assert len(handle_outliers(df, action='remove')) == 100
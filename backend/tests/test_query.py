@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import query
+from app.utils.data_store import delete_dataframe, store_dataframe
+from app.utils.query import filter_rows
+
+SESSION_ID = 'test-query'
+N = 120000
+
+@pytest.fixture(scope='module')
+def df():
+    rng = np.random.default_rng(0)
+    f = rng.normal(size=N).round(2)
+    f[rng.random(N) < 0.1] = np.nan
+    t = pd.Series(pd.date_range('2020-01-01', periods=N, freq='37min'))
+    t[rng.random(N) < 0.05] = pd.NaT
+    nullable = pd.array(rng.integers(0, 10, N), dtype='Int64')
+    nullable[rng.random(N) < 0.1] = pd.NA
+    s = pd.Series(rng.choice(['apple', 'Banana', 'cherry', None], N))
+    frame = pd.DataFrame({
+        'f': f,
+        'i': rng.integers(-50, 50, N),
+        'n': nullable,
+        'b': rng.random(N) < 0.3,
+        's': s,
+        't': t.sample(frac=1, random_state=0).reset_index(drop=True),
+    })
+    store_dataframe(SESSION_ID, frame)
+    yield frame
+    delete_dataframe(SESSION_ID)
+
+def expected_mask(df, f):
+    column, op, value = df[f['column']], f['op'], f.get('value')
+    if pd.api.types.is_datetime64_any_dtype(column) and value is not None:
+        value = [pd.Timestamp(v) for v in value] if isinstance(value, list) else pd.Timestamp(value)
+    if op == 'is_null':
+        return column.isna()
+    if op == 'not_null':
+        return column.notna()
+    if op == 'contains':
+        return column.astype(str).str.contains(value, case=False, regex=False) & column.notna()
+    if op == 'in':
+        return column.isin(value)
+    if op == 'not_in':
+        return ~column.isin(value)
+    if op == 'between':
+        return ((column >= value[0]) & (column <= value[1])).fillna(False)
+    if op == 'ne':
+        return ~(column == value).fillna(False)
+    compare = {'lt': column.lt, 'le': column.le, 'gt': column.gt, 'ge': column.ge, 'eq': column.eq}
+    return compare[op](value).fillna(False)
+
+def check(df, filters):
+    mask = pd.Series(True, index=df.index)
+    for f in filters:
+        mask &= expected_mask(df, f).astype(bool)
+    result = filter_rows(SESSION_ID, df, filters)
+    np.testing.assert_array_equal(result, np.flatnonzero(mask.to_numpy()))
+
+SINGLE_FILTERS = [
+    {'column': 'f', 'op': op, 'value': 0.5} for op in ('lt', 'le', 'gt', 'ge', 'eq', 'ne')
+] + [
+    {'column': 'i', 'op': op, 'value': 7} for op in ('lt', 'le', 'gt', 'ge', 'eq', 'ne')
+] + [
+    {'column': 'n', 'op': op, 'value': 3} for op in ('lt', 'ge', 'eq', 'ne')
+] + [
+    {'column': 'f', 'op': 'between', 'value': [-0.25, 0.25]},
+    {'column': 'f', 'op': 'in', 'value': [0.1, -1.5, 0.1, 99.0]},
+    {'column': 'f', 'op': 'not_in', 'value': [0.1, -1.5]},
+    {'column': 'f', 'op': 'is_null'},
+    {'column': 'f', 'op': 'not_null'},
+    {'column': 'n', 'op': 'in', 'value': [0, 9]},
+    {'column': 'n', 'op': 'not_in', 'value': [0, 9]},
+    {'column': 'n', 'op': 'is_null'},
+    {'column': 'b', 'op': 'eq', 'value': True},
+    {'column': 'b', 'op': 'ne', 'value': True},
+    {'column': 'b', 'op': 'in', 'value': [False]},
+    {'column': 's', 'op': 'eq', 'value': 'apple'},
+    {'column': 's', 'op': 'ne', 'value': 'apple'},
+    {'column': 's', 'op': 'in', 'value': ['Banana', 'cherry', 'missing']},
+    {'column': 's', 'op': 'not_in', 'value': ['Banana']},
+    {'column': 's', 'op': 'contains', 'value': 'AN'},
+    {'column': 's', 'op': 'is_null'},
+    {'column': 's', 'op': 'eq', 'value': 'missing'},
+    {'column': 't', 'op': 'between', 'value': ['2021-01-01', '2021-06-30T12:00:00']},
+    {'column': 't', 'op': 'gt', 'value': '2022-03-01'},
+    {'column': 't', 'op': 'le', 'value': '2020-01-01'},
+    {'column': 't', 'op': 'not_null'},
+]
+
+@pytest.mark.parametrize('f', SINGLE_FILTERS, ids=lambda f: f"{f['column']}-{f['op']}")
+def test_single_filter_matches_pandas(df, f):
+    check(df, [f])
+
+@pytest.mark.parametrize('filters', [
+    # The smaller equality match is materialized, the range is checked on its rows
+    [{'column': 'f', 'op': 'gt', 'value': -3}, {'column': 's', 'op': 'eq', 'value': 'cherry'}],
+    [{'column': 'i', 'op': 'between', 'value': [0, 10]}, {'column': 'n', 'op': 'eq', 'value': 4},
+     {'column': 'b', 'op': 'eq', 'value': False}],
+    [{'column': 't', 'op': 'ge', 'value': '2021-01-01'}, {'column': 'f', 'op': 'ne', 'value': 0},
+     {'column': 's', 'op': 'contains', 'value': 'e'}],
+    # Only scan operators: no index is used
+    [{'column': 'f', 'op': 'not_null'}, {'column': 's', 'op': 'not_in', 'value': ['apple']}],
+    # An empty index match short-circuits
+    [{'column': 'i', 'op': 'gt', 'value': 1000}, {'column': 'f', 'op': 'is_null'}],
+])
+def test_combined_filters_match_pandas(df, filters):
+    check(df, filters)
+
+def test_large_residual_uses_numexpr(df, monkeypatch):
+    if query.numexpr is None:
+        pytest.skip('numexpr is not installed')
+    calls = []
+    evaluate = query.numexpr.evaluate
+    monkeypatch.setattr(query.numexpr, 'evaluate', lambda *a, **k: calls.append(a) or evaluate(*a, **k))
+    # Both ranges match over NUMEXPR_MIN_ROWS rows, so the one not chosen runs through numexpr
+    filters = [{'column': 'f', 'op': 'gt', 'value': -10}, {'column': 'i', 'op': 'lt', 'value': 40}]
+    check(df, filters)
+    check(df, [{'column': 'i', 'op': 'ne', 'value': 3}])
+    assert len(calls) == 2
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.timeseries import downsample_timeseries, lttb_indices, resample_timeseries
+
+def reference_lttb(x, y, threshold):
+    """Textbook Largest-Triangle-Three-Buckets, one point at a time"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        avg_start = math.floor((i + 1) * every) + 1
+        avg_end = min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+@pytest.mark.parametrize('n, threshold', [(10, 3), (100, 7), (1000, 50), (997, 100)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.uniform(0, 1000, n))
+    y = rng.normal(size=n).cumsum()
+    keep = lttb_indices(x, y, threshold)
+    assert len(keep) == threshold
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert keep.tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+
+def test_downsample_keeps_timezone_offsets():
+    times = pd.date_range('2024-03-30', periods=500, freq='15min', tz='Europe/Paris')
+    df = pd.DataFrame({'t': times, 'v': np.sin(np.arange(500) / 10)})
+    series = downsample_timeseries(df, 't', ['v'], max_points=40)['series']['v']
+    assert len(series['values']) == 40
+    assert series['times'][0] == times[0].isoformat()
+    assert series['times'][-1] == times[-1].isoformat()
+    # The window crosses the DST change, so both offsets appear
+    assert {t[-6:] for t in series['times']} == {'+01:00', '+02:00'}
+
+@pytest.mark.parametrize('times, max_points', [
+    (pd.to_datetime(['1900-01-01', '2100-01-01']), 10),
+    (pd.to_datetime(['1900-01-01', '2100-01-01']), 3),
+    (pd.date_range('2015-01-01', periods=5 * 365, freq='D'), 50),
+    (pd.date_range('2015-01-01', periods=5 * 365, freq='D'), 7),
+])
+def test_auto_bucket_always_fits(times, max_points):
+    df = pd.DataFrame({'t': times, 'v': np.arange(len(times), dtype=float)})
+    result = resample_timeseries(df, 't', ['v'], bucket='auto', max_points=max_points)
+    assert 1 <= result['points'] <= max_points
+    assert sum(result['counts']) == len(df)
+
+def test_explicit_bucket_too_fine_is_rejected():
+    df = pd.DataFrame({'t': pd.date_range('2015-01-01', periods=5 * 365, freq='D'), 'v': 1.0})
+    with pytest.raises(ValueError, match="Bucket 'month'"):
+        resample_timeseries(df, 't', ['v'], bucket='month', max_points=5)
@@ -0,0 +1,52 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+client = TestClient(app)
+
+FRAME = pd.DataFrame({
+    'a': np.arange(20),
+    's': ['x', 'y'] * 10,
+    't': pd.date_range('2020', periods=20, freq='D'),
+})
+
+def encode(ext: str) -> bytes:
+    buffer = io.BytesIO()
+    if ext == 'parquet':
+        FRAME.to_parquet(buffer)
+    elif ext == 'feather':
+        FRAME.to_feather(buffer)
+    elif ext == 'jsonl':
+        buffer.write(FRAME.to_json(orient='records', lines=True, date_format='iso').encode())
+    elif ext == 'xlsx':
+        FRAME.to_excel(buffer, index=False)
+    else:
+        buffer.write(FRAME.to_csv(index=False).encode())
+    return buffer.getvalue()
+
+def upload(ext: str, **data):
+    return client.post('/api/upload', files={'file': (f'f.{ext}', encode(ext))}, data=data)
+
+@pytest.mark.parametrize('ext', ['csv', 'parquet', 'feather', 'jsonl', 'xlsx'])
+def test_column_types(ext):
+    summary = upload(ext).json()
+    assert summary['numeric_columns'] == ['a']
+    assert summary['categorical_columns'] == ['s']
+    assert summary['datetime_columns'] == ['t']
+
+@pytest.mark.parametrize('ext', ['csv', 'parquet', 'feather', 'jsonl', 'xlsx'])
+def test_projection(ext):
+    response = upload(ext, columns='a,t')
+    assert response.status_code == 200
+    assert sorted(response.json()['column_names']) == ['a', 't']
+
+@pytest.mark.parametrize('ext', ['csv', 'parquet', 'feather', 'jsonl', 'xlsx'])
+def test_projection_with_unknown_column_is_rejected(ext):
+    response = upload(ext, columns='a,nope')
+    assert response.status_code == 400
+    assert 'nope' in response.json()['detail']